@@ -2,154 +2,684 @@
 Main controller for coordinating video transcription operations.
 """
 
+import concurrent.futures
+import contextlib
+import functools
 import os
+import queue
 import tempfile
+import threading
+import time
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Union, TYPE_CHECKING
 
-from modules.extractor import AudioExtractor
-from modules.transcriber import WhisperTranscriber
-from modules.subtitler import SubtitleGenerator
-from modules.indexer import TranscriptionIndexer
+from modules.segments import SegmentTable, iter_rows
 from utils.logger import get_logger
 
+if TYPE_CHECKING:
+    import numpy as np
+    from modules.extractor import AudioExtractor
+    from modules.transcriber import WhisperTranscriber
+    from modules.subtitler import SubtitleGenerator
+    from modules.indexer import TranscriptionIndexer
+
+# Maximum number of videos whose segments are kept in memory
+SEGMENT_CACHE_SIZE = 8
+
+# Seconds a video's index status stays cached for get_video_info
+INDEX_STATUS_TTL = 5.0
+
 class TranscriptionController:
-    """Main controller for video transcription and search operations."""
+    """Main controller for video transcription and search operations.
+    
+    Whisper runs on one of two paths: transcribe_audio uses a persistent
+    worker process, while transcribe_audio_batch, process_videos and
+    process_video run the model in this process. Switching paths releases
+    the other path's model; a model still used by a running call is freed
+    when that call returns.
+    """
     
     def __init__(self):
         self.logger = get_logger()
-        self.extractor = AudioExtractor()
-        # Transcriber будет создаваться для каждого запроса с указанными параметрами
-        self.subtitler = SubtitleGenerator()
-        self.indexer = TranscriptionIndexer()
+        # Extractor, subtitler and indexer are created lazily by the properties below
+        
+        # In-process transcriber for the last used settings, so its model
+        # stays loaded between calls (see _get_transcriber)
+        self._transcriber_cache = functools.lru_cache(maxsize=1)(self._create_transcriber)
         
-        # Cache for processed videos
-        self.video_cache = {}
+        # Small LRU cache of segment lists loaded from the database
+        self._load_segments = functools.lru_cache(maxsize=SEGMENT_CACHE_SIZE)(self._fetch_segments)
+        # path -> (expires_at, segments_count or None), see get_video_info
+        self._index_status = {}
         
+        # Persistent Whisper worker process used by transcribe_audio
+        self._whisper_process = None
+        self._whisper_lock = threading.Lock()
+        
+        # Shared pool for the independent subtitle and indexing writes
+        self._io_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="finalize")
+        
+    @functools.cached_property
+    def extractor(self) -> "AudioExtractor":
+        """Audio extractor, created on first use."""
+        from modules.extractor import AudioExtractor
+        return AudioExtractor()
+    
+    @functools.cached_property
+    def subtitler(self) -> "SubtitleGenerator":
+        """Subtitle generator, created on first use."""
+        from modules.subtitler import SubtitleGenerator
+        return SubtitleGenerator()
+    
+    @functools.cached_property
+    def indexer(self) -> "TranscriptionIndexer":
+        """Search indexer, created on first use."""
+        from modules.indexer import TranscriptionIndexer
+        return TranscriptionIndexer()
+    
+    def _create_transcriber(self, model_name: str, language=None, batch_size=None) -> "WhisperTranscriber":
+        """Create a transcriber, importing Whisper only when transcription runs."""
+        from modules.transcriber import WhisperTranscriber
+        return WhisperTranscriber(model_name=model_name, language=language, batch_size=batch_size)
+    
+    def _get_transcriber(self, model_name: str, language=None, batch_size=None) -> "WhisperTranscriber":
+        """Return the in-process transcriber, stopping the worker process and its model."""
+        self._close_whisper_process()
+        return self._transcriber_cache(model_name, language, batch_size)
+    
+    def _get_whisper_process(self, model_name: str, language=None, batch_size=None):
+        """Return the worker process for the given model, replacing one with other settings."""
+        from modules.whisper_process import WhisperProcess
+        
+        with self._whisper_lock:
+            worker = self._whisper_process
+            if (worker is None or not worker.is_alive()
+                    or (worker.model_name, worker.language, worker.batch_size) != (model_name, language, batch_size)):
+                if worker is not None:
+                    worker.close()
+                if self._transcriber_cache.cache_info().currsize:
+                    # Release the in-process transcriber and the shared model cache
+                    from modules.transcriber import release_models
+                    self._transcriber_cache.cache_clear()
+                    release_models()
+                worker = WhisperProcess(model_name, language, batch_size)
+                self._whisper_process = worker
+            return worker
+    
+    def _close_whisper_process(self):
+        """Let the worker process finish its current request and exit."""
+        with self._whisper_lock:
+            if self._whisper_process is not None:
+                self._whisper_process.close()
+                self._whisper_process = None
+    
+    def warm_model(self, model_name: str = "base", language=None, batch_size=None):
+        """Start the Whisper worker process so the model loads before it is needed.
+        
+        Returns immediately; the model loads in the worker process, and the
+        first transcription with the same settings reuses it.
+        """
+        self.logger.info("Preloading Whisper model: %s", model_name)
+        self._get_whisper_process(model_name, language, batch_size)
+    
     def extract_audio(self, video_path: str, progress_callback=None) -> str:
         """Extract audio from video file."""
-        self.logger.info(f"Extracting audio from: {video_path}")
+        self.logger.info("Extracting audio from: %s", video_path)
 
         try:
             audio_path = self.extractor.extract(video_path, progress_callback=progress_callback)
-            self.logger.info(f"Audio extracted to: {audio_path}")
+            self.logger.info("Audio extracted to: %s", audio_path)
             return audio_path
         except Exception as e:
-            self.logger.error(f"Audio extraction failed: {str(e)}")
+            self.logger.error("Audio extraction failed: %s", e)
+            raise
+
+    def decode_audio(self, video_path: str, progress_callback=None) -> "np.ndarray":
+        """Decode a video's audio into memory for in-process transcription.
+        
+        Returns:
+            16 kHz mono int16 samples; no temporary file is written
+        """
+        self.logger.info("Decoding audio from: %s", video_path)
+
+        try:
+            return self.extractor.extract_to_array(video_path, progress_callback=progress_callback)
+        except Exception as e:
+            self.logger.error("Audio extraction failed: %s", e)
             raise
 
+    def extract_audio_async(self, video_path: str, progress_callback=None) -> concurrent.futures.Future:
+        """Start extracting audio in the background and return a Future for its path."""
+        self.logger.info("Extracting audio in background from: %s", video_path)
+        return self.extractor.extract_async(video_path, progress_callback=progress_callback)
+
+    @contextlib.contextmanager
+    def extracted_audio(self, video_path: str, progress_callback=None):
+        """Extract audio for the duration of a with-block and delete it afterwards."""
+        audio_path = self.extract_audio(video_path, progress_callback)
+        try:
+            yield audio_path
+        finally:
+            self.extractor.remove(audio_path)
+    
+    def release_audio(self, audio: Union[str, concurrent.futures.Future]):
+        """Delete extracted audio once it is no longer needed.
+        
+        Args:
+            audio: Audio path, or a Future from extract_audio_async; the file
+                is removed when the extraction finishes
+        """
+        if not isinstance(audio, concurrent.futures.Future):
+            self.extractor.remove(audio)
+            return
+        
+        def remove_result(future):
+            if not future.cancelled() and future.exception() is None:
+                self.extractor.remove(future.result())
+        
+        audio.add_done_callback(remove_result)
+
     def extract_audio_segment(self, video_path: str, start: float, end: float, output_path: str) -> str:
         """Extract a specific audio segment from a video."""
         self.logger.info(
-            f"Extracting segment {start}-{end} from: {video_path} -> {output_path}"
+            "Extracting segment %s-%s from: %s -> %s", start, end, video_path, output_path
         )
         try:
             segment_path = self.extractor.extract_segment(video_path, start, end, output_path)
-            self.logger.info(f"Segment extracted: {segment_path}")
+            self.logger.info("Segment extracted: %s", segment_path)
             return segment_path
         except Exception as e:
-            self.logger.error(f"Segment extraction failed: {str(e)}")
+            self.logger.error("Segment extraction failed: %s", e)
+            raise
+    
+    def extract_audio_segments(self, video_path: str, spans: List[Tuple[float, float, str]]) -> List[str]:
+        """Extract several (start, end, output_path) audio segments from a video in parallel."""
+        self.logger.info("Extracting %d segments from: %s", len(spans), video_path)
+        try:
+            segment_paths = self.extractor.extract_segments(video_path, spans)
+            self.logger.info("Segments extracted: %d", len(segment_paths))
+            return segment_paths
+        except Exception as e:
+            self.logger.error("Segment extraction failed: %s", e)
             raise
     
-    def transcribe_audio(self, audio_path: str, model_name="base", language=None, progress_callback=None) -> List[Dict[str, Any]]:
+    def transcribe_audio(self, audio_path: Union[str, concurrent.futures.Future], model_name="base", language=None,
+                         progress_callback=None, batch_size=None) -> SegmentTable:
         """Transcribe audio to text with timestamps.
         
         Args:
-            audio_path: Path to audio file
+            audio_path: Path to audio file, or a Future from extract_audio_async.
+                The worker process starts loading the model before the Future
+                is awaited, so loading overlaps extraction.
             model_name: Whisper model name (tiny, base, small, medium, large)
             language: ISO language code (e.g., 'uk' for Ukrainian), or None for auto-detection
             progress_callback: Optional callback for progress updates
+            batch_size: Audio windows decoded per forward pass (default: transcriber default)
             
         Returns:
-            List of segments with start, end, and text
+            Segments with start, end, and text
         """
-        self.logger.info(f"Transcribing audio: {audio_path}")
-        self.logger.info(f"Using model: {model_name}, language: {language if language else 'auto-detect'}")
+        self.logger.info("Using model: %s, language: %s", model_name, language or 'auto-detect')
         
         try:
-            # Создаем транскрайбер с указанными параметрами
-            transcriber = WhisperTranscriber(model_name=model_name, language=language)
-            segments = transcriber.transcribe(audio_path, progress_callback)
-            self.logger.info(f"Transcription completed: {len(segments)} segments")
+            # Inference runs in a persistent worker process that keeps the model loaded
+            worker = self._get_whisper_process(model_name, language, batch_size)
+            
+            if isinstance(audio_path, concurrent.futures.Future):
+                audio_path = audio_path.result()
+            
+            self.logger.info("Transcribing audio: %s", audio_path)
+            segments = worker.transcribe(audio_path, progress_callback)
+            self.logger.info("Transcription completed: %d segments", len(segments))
             return segments
         except Exception as e:
-            self.logger.error(f"Transcription failed: {str(e)}")
+            self.logger.error("Transcription failed: %s", e)
+            raise
+    
+    def transcribe_audio_batch(self, audio_paths: List[str], model_name="base", language=None,
+                               progress_callback=None) -> Dict[str, SegmentTable]:
+        """Transcribe several audio files with a single loaded model.
+        
+        Args:
+            audio_paths: Paths to audio files
+            model_name: Whisper model name (tiny, base, small, medium, large)
+            language: ISO language code (e.g., 'uk' for Ukrainian), or None for auto-detection
+            progress_callback: Optional callback for overall progress updates
+            
+        Returns:
+            Dictionary mapping each audio path to its segments
+        """
+        self.logger.info("Transcribing %d audio files with model: %s", len(audio_paths), model_name)
+        
+        try:
+            transcriber = self._get_transcriber(model_name, language, None)
+            transcriber.load_model()
+            
+            results = {}
+            for i, audio_path in enumerate(audio_paths):
+                if progress_callback:
+                    progress_callback(int(i * 100 / len(audio_paths)),
+                                      f"Transcribing {Path(audio_path).name} ({i + 1}/{len(audio_paths)})")
+                results[audio_path] = transcriber.transcribe(audio_path)
+            
+            if progress_callback:
+                progress_callback(100, "Transcription completed")
+            return results
+        except Exception as e:
+            self.logger.error("Batch transcription failed: %s", e)
             raise
     
-    def generate_subtitles(self, segments: List[Dict[str, Any]], video_path: str) -> str:
+    def transcribe_and_index(self, transcriber: "WhisperTranscriber", audio_path: Union[str, "np.ndarray"],
+                             video_path: str, progress_callback=None) -> SegmentTable:
+        """Transcribe audio while indexing segments as the transcriber yields them.
+        
+        Segments are handed to an indexing thread through a queue, so the
+        database writes overlap transcription instead of waiting for the
+        complete segment list. Each batch is committed in its own short
+        transaction, so other writers are not blocked while Whisper runs.
+        
+        Args:
+            transcriber: WhisperTranscriber to use
+            audio_path: Path to audio file, or samples from decode_audio
+            video_path: Path of the source video, used as the index key
+            progress_callback: Optional callback for progress updates
+            
+        Returns:
+            Segments with start, end, and text
+        """
+        self.logger.info("Transcribing and indexing: %s", video_path)
+        
+        rows_q = queue.Queue()
+        index_errors = []
+        abort = object()
+        
+        def rows():
+            while True:
+                row = rows_q.get()
+                if row is None:
+                    return
+                if row is abort:
+                    # Raising inside the insert removes the partial index
+                    raise RuntimeError("Transcription aborted")
+                yield row
+        
+        def index_stage():
+            try:
+                self.indexer.index_video_stream(video_path, rows(), transcriber.model_name, transcriber.language)
+            except Exception as e:
+                index_errors.append(e)
+        
+        index_thread = threading.Thread(target=index_stage, name="index-stage", daemon=True)
+        index_thread.start()
+        
+        rows_list = []
+        try:
+            for segment in transcriber.iter_segments(audio_path, progress_callback):
+                row = (segment['start'], segment['end'], segment['text'])
+                rows_list.append(row)
+                rows_q.put(row)
+        except BaseException:
+            rows_q.put(abort)
+            index_thread.join()
+            raise
+        
+        rows_q.put(None)
+        index_thread.join()
+        
+        if index_errors:
+            self.logger.error("Indexing failed: %s", index_errors[0])
+            raise index_errors[0]
+        
+        self._invalidate_caches(video_path)
+        self.logger.info("Transcription and indexing completed: %d segments", len(rows_list))
+        return SegmentTable.from_rows(rows_list)
+    
+    def generate_subtitles(self, segments: Union[SegmentTable, List[Dict[str, Any]]], video_path: str) -> str:
         """Generate subtitle files from transcription segments."""
-        self.logger.info(f"Generating subtitles for: {video_path}")
+        self.logger.info("Generating subtitles for: %s", video_path)
         
         try:
             subtitle_path = self.subtitler.generate(segments, video_path)
-            self.logger.info(f"Subtitles generated: {subtitle_path}")
+            self.logger.info("Subtitles generated: %s", subtitle_path)
             return subtitle_path
         except Exception as e:
-            self.logger.error(f"Subtitle generation failed: {str(e)}")
+            self.logger.error("Subtitle generation failed: %s", e)
             raise
     
-    def index_segments(self, segments: List[Dict[str, Any]], video_path: str):
-        """Index transcription segments for search."""
-        self.logger.info(f"Indexing segments for: {video_path}")
+    def index_segments(self, segments: Union[SegmentTable, List[Dict[str, Any]]], video_path: str,
+                       model_name: Optional[str] = None, language: Optional[str] = None):
+        """Index transcription segments for search, recording the settings that produced them."""
+        self.logger.info("Indexing segments for: %s", video_path)
         
         try:
-            self.indexer.index_video(video_path, segments)
+            self.indexer.index_video_bulk(video_path, iter_rows(segments), model_name, language)
             
-            # Cache the segments
-            self.video_cache[video_path] = segments
+            # Drop cached segments so the next lookup reads the new index
+            self._invalidate_caches(video_path)
             
-            self.logger.info(f"Indexing completed: {len(segments)} segments")
+            self.logger.info("Indexing completed: %d segments", len(segments))
         except Exception as e:
-            self.logger.error(f"Indexing failed: {str(e)}")
+            self.logger.error("Indexing failed: %s", e)
             raise
     
+    def remove_video_index(self, video_path: str):
+        """Remove a video from the search index and forget what is cached about it."""
+        self.indexer.remove_video_index(video_path)
+        self._load_segments.cache_clear()
+        self._index_status.clear()
+        self._indexed_paths.discard(video_path)
+    
+    def finalize(self, segments: Union[SegmentTable, List[Dict[str, Any]]], video_path: str,
+                 model_name: Optional[str] = None, language: Optional[str] = None) -> str:
+        """Generate subtitles and index segments concurrently.
+        
+        Both steps only read the segments, so they run in parallel on the
+        shared I/O pool. Exceptions from either step are re-raised.
+        
+        Args:
+            segments: Transcription segments
+            video_path: Path to video file
+            model_name: Whisper model that produced the segments, if known
+            language: Transcription language, or None for auto-detection
+        
+        Returns:
+            Path to the generated subtitle file
+        """
+        subtitle_future = self._io_pool.submit(self.generate_subtitles, segments, video_path)
+        index_future = self._io_pool.submit(self.index_segments, segments, video_path, model_name, language)
+        concurrent.futures.wait([subtitle_future, index_future])
+        
+        index_future.result()
+        return subtitle_future.result()
+    
     def search_transcription(self, video_path: str, query: str) -> List[Dict[str, Any]]:
         """Search through transcription text."""
-        self.logger.info(f"Searching for '{query}' in: {video_path}")
+        from modules.indexer import MIN_TRIGRAM_QUERY_LENGTH
+        
+        self.logger.info("Searching for '%s' in: %s", query, video_path)
         
         try:
-            results = self.indexer.search(video_path, query)
-            self.logger.info(f"Search completed: {len(results)} results found")
+            if len(query.strip()) < MIN_TRIGRAM_QUERY_LENGTH:
+                # Too short for the trigram index: scan the cached in-memory transcript
+                results = self._search_segments(video_path, query.strip())
+            else:
+                results = self.indexer.search(video_path, query)
+            self.logger.info("Search completed: %d results found", len(results))
             return results
         except Exception as e:
-            self.logger.error(f"Search failed: {str(e)}")
+            self.logger.error("Search failed: %s", e)
             raise
     
-    def get_transcription_segments(self, video_path: str) -> List[Dict[str, Any]]:
-        """Get cached transcription segments for a video."""
-        if video_path in self.video_cache:
-            return self.video_cache[video_path]
+    def _search_segments(self, video_path: str, query: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Substring search over a video's cached segments, in time order."""
+        segments = self._load_segments(video_path)
+        return [
+            {
+                'start': float(segments.starts[i]),
+                'end': float(segments.ends[i]),
+                'text': segments.texts[i],
+                'highlighted_text': segments.texts[i],
+                'rank': 0
+            }
+            for i in segments.find(query, limit)
+        ]
+    
+    def search_all(self, query: str, video_paths: List[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Search several videos concurrently.
+        
+        Args:
+            query: Search query
+            video_paths: Videos to search (default: all indexed videos)
+            
+        Returns:
+            Dictionary mapping each video path with matches to its results
+        """
+        if video_paths is None:
+            video_paths = self.indexer.list_indexed_videos()
+        if not video_paths:
+            return {}
+        
+        self.logger.info("Searching for '%s' in %d videos", query, len(video_paths))
+        
+        # WAL mode lets the per-thread connections read in parallel
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(video_paths)),
+                                                   thread_name_prefix="search") as pool:
+            futures = {pool.submit(self.indexer.search, path, query): path for path in video_paths}
+            results = {}
+            for future in concurrent.futures.as_completed(futures):
+                matches = future.result()
+                if matches:
+                    results[futures[future]] = matches
         
-        # Try to load from database
+        self.logger.info("Search completed: matches in %d videos", len(results))
+        return results
+    
+    def process_videos(self, video_paths: List[str], model_name="base", language=None,
+                       batch_size=None) -> Dict[str, Dict[str, Any]]:
+        """Process several videos through a three-stage pipeline.
+        
+        Audio extraction, transcription (with streaming indexing) and subtitle
+        generation run in separate threads connected by bounded queues, so
+        extraction of the next video overlaps transcription of the current
+        one. Transcription stays on a single thread with a single model
+        instance.
+        
+        Args:
+            video_paths: Paths of the videos to process
+            model_name: Whisper model name (tiny, base, small, medium, large)
+            language: ISO language code, or None for auto-detection
+            batch_size: Audio windows decoded per forward pass (default: transcriber default)
+            
+        Returns:
+            Mapping of video path to a result dict with 'success' and either
+            'subtitle_path' or 'error'
+        """
+        self.logger.info("Processing %d videos with model: %s", len(video_paths), model_name)
+        
+        results = {}
+        # Small queues give back-pressure so extraction cannot run far ahead
+        extract_q = queue.Queue(maxsize=2)
+        transcribe_q = queue.Queue(maxsize=2)
+        
+        def extract_stage():
+            try:
+                for video_path in video_paths:
+                    try:
+                        # Decoded in memory; the pipeline never writes temporary audio files
+                        audio = self.decode_audio(video_path)
+                    except Exception as e:
+                        results[video_path] = {'success': False, 'error': str(e)}
+                        continue
+                    extract_q.put((video_path, audio))
+            finally:
+                extract_q.put(None)
+        
+        def transcribe_stage():
+            transcriber = None
+            load_error = None
+            try:
+                # Load the model while the first video is being extracted
+                transcriber = self._get_transcriber(model_name, language, batch_size)
+                transcriber.load_model()
+            except Exception as e:
+                self.logger.error("Failed to prepare transcriber: %s", e)
+                load_error = e
+            
+            try:
+                while True:
+                    item = extract_q.get()
+                    if item is None:
+                        break
+                    video_path, audio = item
+                    if load_error is not None:
+                        results[video_path] = {'success': False, 'error': str(load_error)}
+                        continue
+                    try:
+                        # Segments are indexed while transcription runs
+                        segments = self.transcribe_and_index(transcriber, audio, video_path)
+                    except Exception as e:
+                        self.logger.error("Transcription failed: %s", e)
+                        results[video_path] = {'success': False, 'error': str(e)}
+                        continue
+                    finally:
+                        # Only the queued videos' samples stay in memory
+                        del item, audio
+                    transcribe_q.put((video_path, segments))
+            finally:
+                transcribe_q.put(None)
+        
+        def write_stage():
+            while True:
+                item = transcribe_q.get()
+                if item is None:
+                    break
+                video_path, segments = item
+                try:
+                    subtitle_path = self.generate_subtitles(segments, video_path)
+                    results[video_path] = {'success': True, 'subtitle_path': subtitle_path}
+                except Exception as e:
+                    results[video_path] = {'success': False, 'error': str(e)}
+        
+        threads = [
+            threading.Thread(target=extract_stage, name="extract-stage", daemon=True),
+            threading.Thread(target=transcribe_stage, name="transcribe-stage", daemon=True),
+            threading.Thread(target=write_stage, name="write-stage", daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        succeeded = sum(1 for result in results.values() if result['success'])
+        self.logger.info("Processed %d/%d videos successfully", succeeded, len(video_paths))
+        return results
+    
+    def process_video(self, video_path: str, model_name="base", language=None, progress_callback=None) -> str:
+        """Transcribe, index and subtitle a video.
+        
+        A transcription of identical content stored under another path is
+        reused when it was made with the same model and language; the video's
+        own path is always transcribed again.
+        
+        Args:
+            video_path: Path to video file
+            model_name: Whisper model name (tiny, base, small, medium, large)
+            language: ISO language code (e.g., 'uk' for Ukrainian), or None for auto-detection
+            progress_callback: Optional callback for transcription progress updates
+            
+        Returns:
+            Path to the generated subtitle file
+        """
+        from modules.indexer import file_fingerprint
+        
+        fingerprint = file_fingerprint(video_path)
+        known_path = None
+        if fingerprint:
+            known_path = self.indexer.find_video_by_fingerprint(fingerprint, model_name, language,
+                                                                exclude_path=video_path)
+        
+        if known_path:
+            # Same bytes were transcribed with the same settings under another path
+            self.logger.info("Reusing transcription of %s for: %s", known_path, video_path)
+            segments = self.get_transcription_segments(known_path)
+            self.index_segments(segments, video_path, model_name, language)
+            return self.generate_subtitles(segments, video_path)
+        
+        # FFmpeg decodes while the model loads; transcription starts once both are done
+        self.logger.info("Decoding audio in background from: %s", video_path)
+        audio_future = self.extractor.extract_to_array_async(video_path)
+        try:
+            transcriber = self._get_transcriber(model_name, language, None)
+            transcriber.load_model()
+        except BaseException:
+            audio_future.cancel()
+            raise
+        segments = self.transcribe_and_index(transcriber, audio_future.result(), video_path, progress_callback)
+        return self.generate_subtitles(segments, video_path)
+    
+    def get_transcription_segments(self, video_path: str) -> SegmentTable:
+        """Get transcription segments for a video, served from a small LRU cache."""
         try:
-            segments = self.indexer.get_all_segments(video_path)
-            if segments:
-                self.video_cache[video_path] = segments
-                return segments
+            return self._load_segments(video_path)
         except Exception as e:
-            self.logger.error(f"Failed to load segments from database: {str(e)}")
+            self.logger.error("Failed to load segments from database: %s", e)
+        
+        return SegmentTable.from_rows([])
+    
+    def _fetch_segments(self, video_path: str) -> SegmentTable:
+        """Load all segments for a video from the database."""
+        return self.indexer.get_segment_table(video_path)
+    
+    @functools.cached_property
+    def _indexed_paths(self) -> set:
+        """Paths of indexed videos, loaded once and kept up to date by this controller."""
+        return set(self.indexer.list_indexed_videos())
+    
+    def _invalidate_caches(self, indexed_path: str):
+        """Drop cached segments and index status after a video has been indexed."""
+        self._load_segments.cache_clear()
+        self._index_status.clear()
+        self._indexed_paths.add(indexed_path)
+    
+    def _get_segment_count(self, video_path: str):
+        """Segment count of an indexed video (None if not indexed), cached briefly."""
+        if video_path not in self._indexed_paths:
+            return None
         
-        return []
+        now = time.monotonic()
+        cached = self._index_status.get(video_path)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        
+        count = self.indexer.get_segment_count(video_path)
+        self._index_status[video_path] = (now + INDEX_STATUS_TTL, count)
+        return count
     
     def get_video_info(self, video_path: str) -> Dict[str, Any]:
         """Get information about a processed video."""
         try:
+            try:
+                size = os.stat(video_path).st_size
+            except FileNotFoundError:
+                size = 0
+            
+            count = self._get_segment_count(video_path)
             info = {
                 'path': video_path,
-                'name': Path(video_path).name,
-                'size': os.path.getsize(video_path) if os.path.exists(video_path) else 0,
-                'transcribed': video_path in self.video_cache or self.indexer.is_video_indexed(video_path),
-                'segments_count': len(self.get_transcription_segments(video_path))
+                'name': os.path.basename(video_path),
+                'size': size,
+                'transcribed': count is not None,
+                'segments_count': count or 0
             }
             return info
         except Exception as e:
-            self.logger.error(f"Failed to get video info: {str(e)}")
+            self.logger.error("Failed to get video info: %s", e)
             return {}
     
+    def cancel(self):
+        """Abort running work: kill FFmpeg extractions and the Whisper worker process.
+        
+        Calls blocked in extraction or transcription fail with an error
+        instead of running to completion.
+        """
+        # Don't create the extractor just to find nothing running
+        if 'extractor' in self.__dict__:
+            self.extractor.kill_running()
+        with self._whisper_lock:
+            if self._whisper_process is not None:
+                self._whisper_process.terminate()
+                self._whisper_process = None
+    
+    def shutdown(self):
+        """Stop the Whisper worker process and close the index database."""
+        self._close_whisper_process()
+        if 'indexer' in self.__dict__:
+            self.indexer.close()
+    
     def cleanup_temp_files(self):
         """Clean up temporary files created during processing."""
         try:
             self.extractor.cleanup()
             self.logger.info("Temporary files cleaned up")
         except Exception as e:
-            self.logger.error(f"Cleanup failed: {str(e)}")
+            self.logger.error("Cleanup failed: %s", e)
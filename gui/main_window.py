@@ -3,18 +3,22 @@ Main window GUI for the Video Transcriber application.
 """
 
 import os
-from pathlib import Path
+import queue
+import time
+from collections import OrderedDict, deque
+import numpy as np
 from PySide6.QtWidgets import (
     QMainWindow, QFileDialog, QMessageBox, QProgressBar,
     QComboBox, QTextBrowser, QMenu, QLineEdit, QDockWidget,
     QVBoxLayout, QHBoxLayout, QWidget, QPushButton, QSplitter,
     QGroupBox, QLabel, QStatusBar, QListWidget, QListWidgetItem,
-    QSizePolicy, QCheckBox
+    QSizePolicy, QCheckBox, QApplication, QStyle, QStyledItemDelegate,
+    QStyleOptionProgressBar, QProgressDialog
 )
-from PySide6.QtCore import QObject, Signal, QThread, Slot, Qt, QUrl
+from PySide6.QtCore import QObject, Signal, QThread, Slot, Qt, QUrl, QRunnable, QThreadPool, QTimer, QSize
 import logging
 from utils.log_handler import QtLogHandler, LogConsoleWidget
-from PySide6.QtGui import QFont, QIcon, QDesktopServices
+from PySide6.QtGui import QFont, QIcon, QDesktopServices, QTextCursor
 
 # Класс CustomTextBrowser предотвращает исчезновение текста после клика
 class CustomTextBrowser(QTextBrowser):
@@ -29,77 +33,282 @@ class CustomTextBrowser(QTextBrowser):
         # Не делаем ничего, это предотвращает очистку текста
         pass
 
-from gui.video_player import VideoPlayer
 from core.controller import TranscriptionController
 from utils.logger import get_logger
 
-class VideoItemWidget(QWidget):
-    """Widget representing a video task with progress."""
+# Videos processed at once: one transcribing while the next extracts audio.
+# Inference is serialized in the controller's Whisper process, so more
+# workers would only hold extracted audio on disk while they wait.
+MAX_ACTIVE_WORKERS = 2
 
-    def __init__(self, video_path: str):
+# Minimum seconds between progress reports from a worker
+PROGRESS_EMIT_INTERVAL = 0.1
+
+# Milliseconds between deliveries of collected progress to the GUI
+PROGRESS_FLUSH_INTERVAL_MS = 100
+
+# Milliseconds to wait for cancelled workers when closing the window
+WORKER_CANCEL_TIMEOUT_MS = 5000
+
+# Number of rendered transcripts kept for quick switching between videos
+TRANSCRIPT_HTML_CACHE_SIZE = 32
+
+# Transcript lines inserted into the document per insertHtml call
+TRANSCRIPT_INSERT_CHUNK = 500
+
+# Concurrent background loads of transcripts from the database
+MAX_SEGMENT_FETCHES = 5
+
+# Number of search results listed under the search box
+MAX_DISPLAYED_RESULTS = 10
+
+# Markup of one search result line
+SEARCH_RESULT_TEMPLATE = (
+    '<p><b>{i}.</b> '
+    '<a href="seek:{start}">[{start_formatted} - {end_formatted}]</a> '
+    '<a href="download:{start}-{end}" style="margin-left:4px">&#128190;</a> '
+    '{text}</p>'
+).format
+
+# File filter shared by the video open dialogs
+VIDEO_FILE_FILTER = "Video Files (*.mp4 *.mkv *.avi *.mov *.wmv *.flv *.webm);;All Files (*)"
+
+# Open dialogs are read-only and must stay native (no DontUseNativeDialog):
+# the OS dialog lists large directories much faster than Qt's own
+VIDEO_DIALOG_OPTIONS = QFileDialog.Option.ReadOnly
+
+def format_times(seconds: np.ndarray) -> list:
+    """Format an array of seconds as HH:MM:SS.ss strings in one pass."""
+    minutes, secs = np.divmod(np.asarray(seconds, dtype=np.float64), 60)
+    hours, minutes = np.divmod(minutes, 60)
+    return [
+        f"{h:02d}:{m:02d}:{s:05.2f}"
+        for h, m, s in zip(hours.astype(int).tolist(), minutes.astype(int).tolist(), secs.tolist())
+    ]
+
+# Item data role holding a queued video's progress (0-100)
+PROGRESS_ROLE = Qt.UserRole + 1
+
+class VideoItemDelegate(QStyledItemDelegate):
+    """Paint a queued video as its name followed by a progress bar.
+
+    Rows are plain QListWidgetItems; painting them here avoids a separate
+    widget with its own layout for every video in the queue.
+    """
+
+    def paint(self, painter, option, index):
+        widget = option.widget
+        style = widget.style() if widget else QApplication.style()
+
+        # Background and selection highlight
+        style.drawPrimitive(QStyle.PE_PanelItemViewItem, option, painter, widget)
+
+        rect = option.rect.adjusted(4, 2, -4, -2)
+        name_rect = rect.adjusted(0, 0, -rect.width() // 2, 0)
+        bar_rect = rect.adjusted(rect.width() // 2, 0, 0, 0)
+
+        name = option.fontMetrics.elidedText(index.data(Qt.DisplayRole) or "", Qt.ElideMiddle, name_rect.width())
+        painter.save()
+        if option.state & QStyle.State_Selected:
+            painter.setPen(option.palette.highlightedText().color())
+        painter.drawText(name_rect, Qt.AlignVCenter | Qt.AlignLeft, name)
+        painter.restore()
+
+        progress = index.data(PROGRESS_ROLE) or 0
+        bar = QStyleOptionProgressBar()
+        bar.rect = bar_rect
+        bar.state = QStyle.State_Enabled
+        bar.direction = option.direction
+        bar.fontMetrics = option.fontMetrics
+        bar.palette = option.palette
+        bar.minimum = 0
+        bar.maximum = 100
+        bar.progress = progress
+        bar.text = f"{progress}%"
+        bar.textVisible = True
+        style.drawControl(QStyle.CE_ProgressBar, bar, painter, widget)
+
+    def sizeHint(self, option, index):
+        size = super().sizeHint(option, index)
+        return QSize(size.width(), max(size.height(), option.fontMetrics.height() + 10))
+
+class SegmentsFetchSignals(QObject):
+    """Signals for SegmentsFetchRunnable (QRunnable cannot emit signals itself)."""
+
+    finished = Signal(str, object)  # video path, segments
+
+class SegmentsFetchRunnable(QRunnable):
+    """Load a video's transcription segments off the GUI thread."""
+
+    def __init__(self, controller, video_path):
         super().__init__()
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
-        self.label = QLabel(Path(video_path).name)
-        self.progress = QProgressBar()
-        self.progress.setValue(0)
-        self.progress.setMaximum(100)
-        layout.addWidget(self.label)
-        layout.addWidget(self.progress)
-
-class TranscriptionWorker(QThread):
-    """Worker thread for video transcription to prevent GUI freezing."""
-
-    progress_updated = Signal(str, int, str)  # video path, progress, status
+        self.controller = controller
+        self.video_path = video_path
+        self.signals = SegmentsFetchSignals()
+
+    def run(self):
+        segments = self.controller.get_transcription_segments(self.video_path)
+        self.signals.finished.emit(self.video_path, segments)
+
+class ProgressAggregator(QObject):
+    """Collect progress from worker threads and deliver it in one signal per tick.
+
+    Workers call push() from any thread; a timer on the GUI thread drains the
+    queue, keeps the latest update per video and emits them as one list.
+    """
+
+    bulk_progress = Signal(list)  # [(video path, progress, status), ...]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._updates = queue.SimpleQueue()
+        self._timer = QTimer(self)
+        self._timer.setInterval(PROGRESS_FLUSH_INTERVAL_MS)
+        self._timer.timeout.connect(self.flush)
+
+    def push(self, video_path, percent, message):
+        """Record a progress update; safe to call from any thread."""
+        self._updates.put((video_path, percent, message))
+
+    def start(self):
+        """Start periodic delivery (GUI thread only)."""
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def stop(self):
+        """Deliver what is pending and stop the timer (GUI thread only)."""
+        self.flush()
+        self._timer.stop()
+
+    def flush(self):
+        """Emit the latest pending update of each video, if any."""
+        latest = {}
+        while True:
+            try:
+                video_path, percent, message = self._updates.get_nowait()
+            except queue.Empty:
+                break
+            latest[video_path] = (video_path, percent, message)
+        if latest:
+            self.bulk_progress.emit(list(latest.values()))
+
+class TranscriptionCancelled(Exception):
+    """Raised inside a TranscriptionWorker once cancel() was requested."""
+
+class TranscriptionSignals(QObject):
+    """Signals for TranscriptionWorker (QRunnable cannot emit signals itself)."""
+
     transcription_completed = Signal(str, bool, str)  # video path, success, msg
+
+class TranscriptionWorker(QRunnable):
+    """Transcribe one video on the window's worker pool to prevent GUI freezing.
+
+    Up to MAX_ACTIVE_WORKERS run at once on pooled threads. Extraction happens
+    on the extractor's pool and inference in the controller's Whisper process,
+    so while one worker transcribes, the next one is already extracting audio.
+    """
     
-    def __init__(self, controller, video_path, model_name="base", language=None):
+    def __init__(self, controller, video_path, model_name="base", language=None, batch_size=None,
+                 report_progress=None):
         super().__init__()
+        # The window keeps the worker until its completion is handled
+        self.setAutoDelete(False)
+        self.signals = TranscriptionSignals()
         self.controller = controller
+        # Called with (video path, progress, status) from this thread
+        self.report_progress = report_progress or (lambda *update: None)
         self.video_path = video_path
         self.model_name = model_name
         self.language = language
+        self.batch_size = batch_size
         self.logger = get_logger()
+        self._last_progress_emit = 0.0
+        self._last_progress = None
+        self.cancel_requested = False
+    
+    def cancel(self):
+        """Ask the worker to stop at its next progress report."""
+        self.cancel_requested = True
+    
+    def _check_cancelled(self):
+        if self.cancel_requested:
+            raise TranscriptionCancelled()
     
     def run(self):
         """Run the transcription process."""
         try:
-            self.progress_updated.emit(self.video_path, 10, "Extracting audio...")
-            audio_path = self.controller.extract_audio(self.video_path, self.audio_progress_callback)
+            self.report_progress(self.video_path, 10, "Extracting audio...")
+            # Extraction runs in the background while the model loads
+            audio_future = self.controller.extract_audio_async(self.video_path, self.audio_progress_callback)
 
-            self.progress_updated.emit(self.video_path, 30, "Starting transcription...")
-            segments = self.controller.transcribe_audio(audio_path, self.model_name, self.language, self.progress_callback)
-
-            self.progress_updated.emit(self.video_path, 90, "Generating subtitles...")
-            subtitle_path = self.controller.generate_subtitles(segments, self.video_path)
+            self.report_progress(self.video_path, 30, "Starting transcription...")
+            try:
+                segments = self.controller.transcribe_audio(audio_future, self.model_name, self.language,
+                                                            self.progress_callback, self.batch_size)
+            finally:
+                # The extracted audio is not needed after transcription
+                self.controller.release_audio(audio_future)
 
-            self.progress_updated.emit(self.video_path, 95, "Indexing for search...")
-            self.controller.index_segments(segments, self.video_path)
+            self._check_cancelled()
+            self.report_progress(self.video_path, 90, "Generating subtitles and indexing for search...")
+            subtitle_path = self.controller.finalize(segments, self.video_path, self.model_name, self.language)
 
-            self.progress_updated.emit(self.video_path, 100, "Transcription completed!")
-            self.transcription_completed.emit(self.video_path, True, f"Transcription completed. Subtitles saved to: {subtitle_path}")
+            self.report_progress(self.video_path, 100, "Transcription completed!")
+            self.signals.transcription_completed.emit(self.video_path, True, f"Transcription completed. Subtitles saved to: {subtitle_path}")
             
         except Exception as e:
+            if self.cancel_requested:
+                self.logger.info(f"Transcription cancelled: {self.video_path}")
+                self.signals.transcription_completed.emit(self.video_path, False, "Transcription cancelled")
+                return
+
             self.logger.error(f"Transcription failed: {str(e)}")
-            self.transcription_completed.emit(self.video_path, False, f"Transcription failed: {str(e)}")
+            self.signals.transcription_completed.emit(self.video_path, False, f"Transcription failed: {str(e)}")
+    
+    def _emit_progress(self, progress, message, final=False):
+        """Report progress, throttled to PROGRESS_EMIT_INTERVAL and skipped if unchanged.
+        
+        Reports are picked up on the GUI thread by the ProgressAggregator,
+        so the worker never has to pump the GUI event loop itself.
+        """
+        self._check_cancelled()
+        if (progress, message) == self._last_progress:
+            return
+        now = time.monotonic()
+        if final or now - self._last_progress_emit >= PROGRESS_EMIT_INTERVAL:
+            self._last_progress_emit = now
+            self._last_progress = (progress, message)
+            self.report_progress(self.video_path, progress, message)
     
     def progress_callback(self, percentage, message=""):
         """Callback for transcription progress updates."""
         progress = 30 + int(percentage * 0.6)  # Map 0-100% to 30-90%
-        self.progress_updated.emit(self.video_path, progress, message or "Transcribing...")
-        
-        # Добавляем обработку событий UI для обновления в реальном времени
-        from PySide6.QtWidgets import QApplication
-        QApplication.processEvents()
+        self._emit_progress(progress, message or "Transcribing...", percentage >= 100)
     
     def audio_progress_callback(self, percentage, message=""):
         """Callback for audio extraction progress updates."""
         progress = 10 + int(percentage * 0.2)  # Map 0-100% to 10-30%
-        self.progress_updated.emit(self.video_path, progress, message or "Extracting audio...")
-        
-        # Добавляем обработку событий UI для обновления в реальном времени
-        from PySide6.QtWidgets import QApplication
-        QApplication.processEvents()
+        self._emit_progress(progress, message or "Extracting audio...", percentage >= 100)
+
+class FFmpegSetupWorker(QThread):
+    """Download FFmpeg off the GUI thread, reporting progress through signals."""
+
+    progress = Signal(int, str)  # percentage, message
+    done = Signal(bool)  # FFmpeg is available
+
+    def __init__(self, ffmpeg_manager):
+        super().__init__()
+        self.ffmpeg_manager = ffmpeg_manager
+
+    def run(self):
+        """Run the FFmpeg check and download."""
+        self.done.emit(self.ffmpeg_manager.ensure_ffmpeg(self.progress_callback))
+
+    def progress_callback(self, percentage, message):
+        """Forward download progress; raising here aborts the download."""
+        if self.isInterruptionRequested():
+            raise RuntimeError("FFmpeg setup cancelled")
+        self.progress.emit(percentage, message)
 
 class MainWindow(QMainWindow):
     """Main application window."""
@@ -116,7 +325,30 @@ class MainWindow(QMainWindow):
         self.video_info = {}
         self.search_results = []
         self.video_tasks = {}
+        self.video_basenames = {}
         self.workers = {}
+        # (path, model_name, language, batch_size) waiting for a free worker slot
+        self.pending_tasks = deque()
+        # Queued tasks wait while FFmpeg is being downloaded (see setup_ffmpeg)
+        self.ffmpeg_ready = True
+        self._ffmpeg_setup = None
+        # (model, language, batch size) of the last started task; the Whisper
+        # process keeps that model loaded, so matching tasks go first
+        self._loaded_model_settings = None
+        # video path -> (rendered transcript HTML lines, {seconds: formatted time}),
+        # least recently shown first
+        self._transcript_cache = OrderedDict()
+        # Progress from all workers, applied in one batch per tick
+        self.progress_aggregator = ProgressAggregator(self)
+        # Last progress message shown in the status bar, see update_progress
+        self._last_status_message = None
+        self.progress_aggregator.bulk_progress.connect(self.apply_bulk_progress)
+        # Pooled threads for transcription workers, reused across videos
+        self.worker_pool = QThreadPool(self)
+        self.worker_pool.setMaxThreadCount(MAX_ACTIVE_WORKERS)
+        # Pool for loading transcripts without blocking the GUI
+        self.fetch_pool = QThreadPool(self)
+        self.fetch_pool.setMaxThreadCount(MAX_SEGMENT_FETCHES)
         
         # Set up UI
         self.setup_ui()
@@ -136,8 +368,34 @@ class MainWindow(QMainWindow):
         # Настраиваем статусную строку
         self.statusBar().showMessage("Ready. Select a video to start.")
         
+        # Load the selected model while the user is still picking videos. Deferred
+        # to the event loop so that setup_ffmpeg, called right after the window
+        # is created, can hold it back until FFmpeg is installed
+        QTimer.singleShot(0, self.start_model_warmup)
+        
         self.logger.info("Application started successfully")
+    
+    def start_model_warmup(self):
+        """Preload the selected Whisper model unless FFmpeg is still being set up.
+        
+        The worker process would otherwise download FFmpeg a second time into
+        the same directory; _ffmpeg_setup_finished calls this again.
+        """
+        if not self.ffmpeg_ready:
+            return
+        # Widgets are read here because the pool thread must not touch them
+        model_name = self.model_combo.currentText()
+        language = self.lang_combo.currentData()
+        batch_size = self.batch_combo.currentData()
+        QThreadPool.globalInstance().start(lambda: self.warm_model(model_name, language, batch_size))
         
+    def warm_model(self, model_name, language, batch_size):
+        """Preload the Whisper model in the background (runs on the thread pool)."""
+        try:
+            self.controller.warm_model(model_name, language, batch_size)
+        except Exception as e:
+            self.logger.warning(f"Failed to preload Whisper model: {e}")
+    
     def setup_ui(self):
         """Setup the user interface."""
         self.setWindowTitle("Offline Video Transcriber & Searcher")
@@ -158,8 +416,14 @@ class MainWindow(QMainWindow):
         video_group = QGroupBox("Video Player")
         video_layout = QVBoxLayout(video_group)
         
-        self.video_player = VideoPlayer()
-        video_layout.addWidget(self.video_player)
+        # The player and the Qt Multimedia backend are created on first use,
+        # see the video_player property
+        self.video_layout = video_layout
+        self._video_player = None
+        self.video_placeholder = QLabel("No video loaded")
+        self.video_placeholder.setAlignment(Qt.AlignCenter)
+        self.video_placeholder.setMinimumSize(320, 240)
+        video_layout.addWidget(self.video_placeholder)
         
         splitter.addWidget(video_group)
         
@@ -221,6 +485,18 @@ class MainWindow(QMainWindow):
         lang_layout.addWidget(lang_label)
         lang_layout.addWidget(self.lang_combo)
         settings_layout.addLayout(lang_layout)
+        
+        # Batch size for faster-whisper batched inference
+        batch_layout = QHBoxLayout()
+        batch_label = QLabel("Batch Size:")
+        self.batch_combo = QComboBox()
+        for size in (1, 2, 4, 8, 16, 32):
+            self.batch_combo.addItem(str(size), size)
+        self.batch_combo.setCurrentText("8")
+        self.batch_combo.setToolTip("Audio windows decoded together; larger values use more GPU memory")
+        batch_layout.addWidget(batch_label)
+        batch_layout.addWidget(self.batch_combo)
+        settings_layout.addLayout(batch_layout)
 
         # Option to re-transcribe videos that were already processed
         self.retranscribe_checkbox = QCheckBox("Reprocess if already transcribed")
@@ -255,6 +531,8 @@ class MainWindow(QMainWindow):
         queue_group = QGroupBox("Video Queue")
         queue_layout = QVBoxLayout(queue_group)
         self.video_list = QListWidget()
+        self.video_list.setItemDelegate(VideoItemDelegate(self.video_list))
+        self.video_list.setUniformItemSizes(True)
         self.video_list.setContextMenuPolicy(Qt.CustomContextMenu)
         queue_layout.addWidget(self.video_list)
 
@@ -287,6 +565,8 @@ class MainWindow(QMainWindow):
         self.transcript_display = CustomTextBrowser()
         self.transcript_display.setPlaceholderText("Transcription will appear here after processing...")
         self.transcript_display.setReadOnly(True)
+        # Read-only view: don't keep undo history for every inserted chunk
+        self.transcript_display.setUndoRedoEnabled(False)
         self.transcript_display.anchorClicked.connect(self.handle_transcript_click)
         transcript_layout.addWidget(self.transcript_display)
 
@@ -312,6 +592,19 @@ class MainWindow(QMainWindow):
         self.setStatusBar(QStatusBar())
         self.statusBar().showMessage("Ready")
         
+    @property
+    def video_player(self):
+        """Video player widget, created when it is first needed."""
+        if self._video_player is None:
+            from gui.video_player import VideoPlayer
+            self._video_player = VideoPlayer()
+            self._video_player.media_error.connect(
+                lambda message: self.show_error("Playback Error", f"Failed to load video:\n{message}")
+            )
+            self.video_layout.replaceWidget(self.video_placeholder, self._video_player)
+            self.video_placeholder.deleteLater()
+        return self._video_player
+    
     def setup_log_console(self):
         """Создает и настраивает консоль логов"""
         # Создаем докуемое окно для консоли
@@ -360,7 +653,8 @@ class MainWindow(QMainWindow):
             self,
             "Select Video File",
             "",
-            "Video Files (*.mp4 *.mkv *.avi *.mov *.wmv *.flv *.webm);;All Files (*)"
+            VIDEO_FILE_FILTER,
+            options=VIDEO_DIALOG_OPTIONS
         )
         
         if file_path:
@@ -375,7 +669,7 @@ class MainWindow(QMainWindow):
                 self.search_input.setEnabled(False)
                 self.search_btn.setEnabled(False)
                 
-                self.statusBar().showMessage(f"Loaded: {Path(file_path).name}")
+                self.statusBar().showMessage(f"Loaded: {self.video_basename(file_path)}")
                 self.logger.info(f"Video loaded: {file_path}")
                 
             except Exception as e:
@@ -388,59 +682,85 @@ class MainWindow(QMainWindow):
             self,
             "Select Video Files",
             "",
-            "Video Files (*.mp4 *.mkv *.avi *.mov *.wmv *.flv *.webm);;All Files (*)"
+            VIDEO_FILE_FILTER,
+            options=VIDEO_DIALOG_OPTIONS
         )
 
         if files:
-            for path in files:
-                if path in self.video_tasks:
-                    continue
-                item = QListWidgetItem()
-                item.setData(Qt.UserRole, path)
-                widget = VideoItemWidget(path)
-                item.setSizeHint(widget.sizeHint())
-                self.video_list.addItem(item)
-                self.video_list.setItemWidget(item, widget)
-                self.video_tasks[path] = widget
+            self.add_queue_items(files)
             if not self.current_video_path:
                 self.current_video_path = files[0]
                 self.video_player.load_video(files[0])
                 self.transcribe_btn.setEnabled(True)
 
+    def video_basename(self, path):
+        """File name of a video, computed once per path."""
+        name = self.video_basenames.get(path)
+        if name is None:
+            name = self.video_basenames[path] = os.path.basename(path)
+        return name
+
+    def set_task_progress(self, path, percent):
+        """Set the progress shown in a video's queue row."""
+        item = self.video_tasks.get(path)
+        if item:
+            # Changing item data repaints just that row
+            item.setData(PROGRESS_ROLE, percent)
+
+    def add_queue_items(self, paths, progress=0):
+        """Add rows for new videos to the queue list with a single repaint."""
+        existing = set(self.video_tasks)
+        self.video_list.setUpdatesEnabled(False)
+        self.video_list.blockSignals(True)
+        try:
+            for path in paths:
+                if path in existing:
+                    continue
+                existing.add(path)
+                item = QListWidgetItem(self.video_basename(path))
+                item.setData(Qt.UserRole, path)
+                item.setData(PROGRESS_ROLE, progress)
+                self.video_list.addItem(item)
+                self.video_tasks[path] = item
+        finally:
+            self.video_list.blockSignals(False)
+            self.video_list.setUpdatesEnabled(True)
+            self.video_list.updateGeometries()
+
     def add_processed_videos(self):
         """Add already processed videos to the queue without reprocessing."""
         files, _ = QFileDialog.getOpenFileNames(
             self,
             "Select Processed Videos",
             "",
-            "Video Files (*.mp4 *.mkv *.avi *.mov *.wmv *.flv *.webm);;All Files (*)"
+            VIDEO_FILE_FILTER,
+            options=VIDEO_DIALOG_OPTIONS
         )
 
-        if files:
-            added = False
-            for path in files:
-                if path in self.video_tasks:
-                    continue
-                segments = self.controller.get_transcription_segments(path)
-                if not segments:
-                    continue
-                item = QListWidgetItem()
-                item.setData(Qt.UserRole, path)
-                widget = VideoItemWidget(path)
-                widget.progress.setValue(100)
-                item.setSizeHint(widget.sizeHint())
-                self.video_list.addItem(item)
-                self.video_list.setItemWidget(item, widget)
-                self.video_tasks[path] = widget
-                added = True
+        # Transcripts are loaded concurrently; rows are added as they arrive
+        for path in files:
+            if path not in self.video_tasks:
+                self.fetch_segments(path, self._processed_video_loaded)
 
-            if added and not self.current_video_path:
-                self.current_video_path = files[0]
-                self.video_player.load_video(files[0])
-                self.search_input.setEnabled(True)
-                self.search_btn.setEnabled(True)
-                self.transcribe_btn.setEnabled(True)
-                self.display_transcription()
+    def fetch_segments(self, path, slot):
+        """Load segments for a video in the background and pass them to slot."""
+        runnable = SegmentsFetchRunnable(self.controller, path)
+        runnable.signals.finished.connect(slot, Qt.QueuedConnection)
+        self.fetch_pool.start(runnable)
+
+    def _processed_video_loaded(self, path, segments):
+        """Add a processed video to the queue once its transcript is loaded."""
+        if not segments or path in self.video_tasks:
+            return
+        self.add_queue_items([path], progress=100)
+
+        if not self.current_video_path:
+            self.current_video_path = path
+            self.video_player.load_video(path)
+            self.search_input.setEnabled(True)
+            self.search_btn.setEnabled(True)
+            self.transcribe_btn.setEnabled(True)
+            self.display_transcription()
 
     def queue_item_clicked(self, item):
         """Load the selected video in the player."""
@@ -450,14 +770,18 @@ class MainWindow(QMainWindow):
         try:
             self.current_video_path = path
             self.video_player.load_video(path)
-            segments = self.controller.get_transcription_segments(path)
-            if segments:
-                self.search_input.setEnabled(True)
-                self.search_btn.setEnabled(True)
-                self.display_transcription()
+            self.fetch_segments(path, self._selected_video_loaded)
         except Exception as e:
             self.logger.error(f"Failed to load selected video: {e}")
 
+    def _selected_video_loaded(self, path, segments):
+        """Show the transcript of the selected video once it is loaded."""
+        if path != self.current_video_path or not segments:
+            return
+        self.search_input.setEnabled(True)
+        self.search_btn.setEnabled(True)
+        self.display_transcription()
+
     def show_queue_context_menu(self, position):
         """Show context menu for items in the video queue."""
         item = self.video_list.itemAt(position)
@@ -477,31 +801,67 @@ class MainWindow(QMainWindow):
         if not path:
             return
 
-        if path in self.workers and self.workers[path].isRunning():
+        if self.is_task_queued(path):
             self.logger.info(f"Video already being processed: {path}")
             return
 
         try:
-            self.controller.indexer.remove_video_index(path)
+            self.controller.remove_video_index(path)
         except Exception as e:
             self.logger.warning(f"Failed to remove previous index: {e}")
+        self._transcript_cache.pop(path, None)
 
-        widget = self.video_tasks.get(path)
-        if widget:
-            widget.progress.setValue(0)
+        self.set_task_progress(path, 0)
 
         model_name = self.model_combo.currentText()
         language = self.lang_combo.currentData()
 
-        worker = TranscriptionWorker(self.controller, path, model_name, language)
-        worker.progress_updated.connect(self.update_task_progress)
-        worker.transcription_completed.connect(self.task_finished)
-        self.workers[path] = worker
-        worker.start()
+        self.queue_task(path, model_name, language, self.batch_combo.currentData())
 
         self.progress_bar.setVisible(True)
         self.logger.info(f"Reprocessing video: {path}")
     
+    def is_task_queued(self, path):
+        """Check whether a video is being processed or waiting to be."""
+        return path in self.workers or any(task[0] == path for task in self.pending_tasks)
+    
+    def queue_task(self, path, model_name, language, batch_size=None):
+        """Queue a video for transcription and start it when a worker slot is free."""
+        self.pending_tasks.append((path, model_name, language, batch_size))
+        self.start_pending_tasks()
+    
+    def _next_pending_task(self):
+        """Pop the next queued task, preferring ones that reuse the loaded model.
+        
+        Switching model settings restarts the Whisper process and reloads the
+        model, so queued videos are grouped by settings rather than taken
+        strictly in order.
+        """
+        for i, task in enumerate(self.pending_tasks):
+            if task[1:] == self._loaded_model_settings:
+                del self.pending_tasks[i]
+                return task
+        task = self.pending_tasks.popleft()
+        self._loaded_model_settings = task[1:]
+        return task
+    
+    def start_pending_tasks(self):
+        """Start queued videos while fewer than MAX_ACTIVE_WORKERS are running."""
+        if not self.ffmpeg_ready:
+            if self.pending_tasks:
+                self.statusBar().showMessage("Waiting for FFmpeg setup to finish...")
+            return
+        while self.pending_tasks and len(self.workers) < MAX_ACTIVE_WORKERS:
+            path, model_name, language, batch_size = self._next_pending_task()
+            worker = TranscriptionWorker(self.controller, path, model_name, language, batch_size,
+                                         self.progress_aggregator.push)
+            # Workers emit from their own threads; completion is queued to the GUI thread
+            worker.signals.transcription_completed.connect(self.task_finished, Qt.QueuedConnection)
+            self.workers[path] = worker
+            self.worker_pool.start(worker)
+        if self.workers:
+            self.progress_aggregator.start()
+    
     def start_transcription(self):
         """Start transcription for all queued videos."""
         if not self.video_tasks:
@@ -528,19 +888,15 @@ class MainWindow(QMainWindow):
 
         workers_started = False
         force_reprocess = self.retranscribe_checkbox.isChecked()
-        for path in list(self.video_tasks.keys()):
-            if path in self.workers:
+        # One query for all queued videos instead of one per video
+        indexed = set() if force_reprocess else self.controller.indexer.get_indexed_paths(self.video_tasks)
+        for path in self.video_tasks:
+            if self.is_task_queued(path):
                 continue
-            if self.controller.indexer.is_video_indexed(path) and not force_reprocess:
-                widget = self.video_tasks.get(path)
-                if widget:
-                    widget.progress.setValue(100)
+            if path in indexed:
+                self.set_task_progress(path, 100)
                 continue
-            worker = TranscriptionWorker(self.controller, path, model_name, language)
-            worker.progress_updated.connect(self.update_task_progress)
-            worker.transcription_completed.connect(self.task_finished)
-            self.workers[path] = worker
-            worker.start()
+            self.queue_task(path, model_name, language, self.batch_combo.currentData())
             workers_started = True
 
         if workers_started:
@@ -558,9 +914,9 @@ class MainWindow(QMainWindow):
         
         # Если есть информация о видео, добавим информацию о времени
         time_info = ""
-        if hasattr(self, 'current_video_path') and self.current_video_path and hasattr(self.video_player, 'media_player') and self.video_player.media_player.duration() > 0:
+        if self.current_video_path and self._video_player is not None and self.video_player.duration_ms > 0:
             # Оцениваем, сколько секунд видео было обработано
-            video_duration = self.video_player.media_player.duration() / 1000  # Длительность в секундах
+            video_duration = self.video_player.duration_ms / 1000  # Длительность в секундах
             processed_seconds = (video_duration * percent) / 100
             
             # Форматируем время
@@ -569,19 +925,29 @@ class MainWindow(QMainWindow):
             
             time_info = f" - Processed {processed_formatted} of {total_formatted}"
         
-        if message:
-            status_message = f"Progress: {message} ({percent}%){time_info}"
-            self.statusBar().showMessage(status_message)
+        # The percentage and processed time change on every tick and are shown
+        # on the progress bar; the status bar and log only follow the message
+        self.progress_bar.setFormat(f"%p%{time_info}")
+        if message and message != self._last_status_message:
+            self._last_status_message = message
+            self.statusBar().showMessage(f"Progress: {message}")
             self.logger.info(f"Transcription progress: {message} ({percent}%){time_info}")
 
     def update_task_progress(self, video_path, percent, message):
         """Update progress for a specific video task."""
-        widget = self.video_tasks.get(video_path)
-        if widget:
-            widget.progress.setValue(percent)
+        self.set_task_progress(video_path, percent)
         if video_path == self.current_video_path:
             self.update_progress(percent, message)
     
+    def apply_bulk_progress(self, updates):
+        """Apply a batch of (video path, progress, status) updates with one repaint."""
+        self.video_list.setUpdatesEnabled(False)
+        try:
+            for video_path, percent, message in updates:
+                self.update_task_progress(video_path, percent, message)
+        finally:
+            self.video_list.setUpdatesEnabled(True)
+    
     def _single_transcription_finished(self, success, message):
         """Handle completion for the currently loaded video."""
         # Re-enable controls
@@ -601,20 +967,25 @@ class MainWindow(QMainWindow):
         self.progress_bar.setValue(100)
         
         # Update status
-        video_name = Path(self.current_video_path).name
+        video_name = self.video_basename(self.current_video_path)
         segments = self.controller.get_transcription_segments(self.current_video_path)
         self.logger.info(f"Transcription completed successfully: {len(segments)} segments")
         self.statusBar().showMessage(f"Transcription of '{video_name}' completed: {len(segments)} segments. Ready for search.")
 
     def task_finished(self, video_path, success, message):
         """Handle completion of a video task."""
-        widget = self.video_tasks.get(video_path)
-        if widget and success:
-            widget.progress.setValue(100)
+        # Apply updates reported before completion so none lands after it
+        self.progress_aggregator.flush()
+        if success:
+            self.set_task_progress(video_path, 100)
+        # The transcript changed, so the rendered HTML is stale
+        self._transcript_cache.pop(video_path, None)
         if video_path == self.current_video_path:
             self._single_transcription_finished(success, message)
         self.workers.pop(video_path, None)
+        self.start_pending_tasks()
         if not self.workers:
+            self.progress_aggregator.stop()
             self.transcribe_btn.setEnabled(True)
             self.load_video_btn.setEnabled(True)
             self.progress_bar.setVisible(False)
@@ -645,33 +1016,36 @@ class MainWindow(QMainWindow):
             return
             
         # Format and display results
-        html_results = []
-        for i, result in enumerate(self.search_results[:10], 1):  # Limit to 10 results
-            start_time = result['start']
-            start_formatted = self.format_time(start_time)
-            end_formatted = self.format_time(result['end'])
-            text = result['text']
-            
-            # Create clickable search result
-            end_time = result['end']
-            html_result = (
-                f'<p><b>{i}.</b> '
-                f'<a href="seek:{start_time}">[{start_formatted} - {end_formatted}]</a> '
-                f'<a href="download:{start_time}-{end_time}" style="margin-left:4px">&#128190;</a> '
-                f'{text}</p>'
-            )
-            html_results.append(html_result)
+        shown_results = self.search_results[:MAX_DISPLAYED_RESULTS]
+        starts_formatted = self.format_result_times([result['start'] for result in shown_results])
+        ends_formatted = self.format_result_times([result['end'] for result in shown_results])
         
-        if html_results:
-            self.search_results_display.setHtml(f"<h3>Search Results ({len(self.search_results)}):</h3>\n" + "\n".join(html_results))
-        else:
-            self.search_results_display.setHtml("<p>No results found.</p>")
+        # Create clickable search results
+        html_results = "\n".join(
+            SEARCH_RESULT_TEMPLATE(i=i, start=result['start'], end=result['end'],
+                                   start_formatted=start_formatted, end_formatted=end_formatted,
+                                   text=result['text'])
+            for i, (result, start_formatted, end_formatted)
+            in enumerate(zip(shown_results, starts_formatted, ends_formatted), 1)
+        )
+        self.search_results_display.setHtml(f"<h3>Search Results ({len(self.search_results)}):</h3>\n" + html_results)
         
         # Jump to first result for convenience
         if self.search_results:
             self.video_player.seek_to_time(self.search_results[0]['start'])
             self.logger.info(f"Auto-seeking to first result at {self.search_results[0]['start']:.2f} seconds")
             
+    def format_result_times(self, seconds):
+        """Format times of the current video, reusing labels of its displayed transcript."""
+        cached = self._transcript_cache.get(self.current_video_path)
+        if cached is None:
+            return format_times(seconds)
+        time_labels = cached[1]
+        missing = [value for value in seconds if value not in time_labels]
+        if missing:
+            time_labels.update(zip(missing, format_times(missing)))
+        return [time_labels[value] for value in seconds]
+    
     def format_time(self, seconds):
         """Format seconds as HH:MM:SS."""
         m, s = divmod(seconds, 60)
@@ -737,8 +1111,8 @@ class MainWindow(QMainWindow):
         try:
             padded_start = max(0.0, start - 1.0)
             video_duration = None
-            if self.video_player.media_player.duration() > 0:
-                video_duration = self.video_player.media_player.duration() / 1000
+            if self.video_player.duration_ms > 0:
+                video_duration = self.video_player.duration_ms / 1000
             padded_end = end + 1.0
             if video_duration is not None:
                 padded_end = min(video_duration, padded_end)
@@ -754,45 +1128,121 @@ class MainWindow(QMainWindow):
         """Display transcription in the UI."""
         if not self.current_video_path:
             return
+        
+        cached = self._transcript_cache.get(self.current_video_path)
+        if cached is not None:
+            self._transcript_cache.move_to_end(self.current_video_path)
+            self._render_transcript(cached[0])
+            return
             
         segments = self.controller.get_transcription_segments(self.current_video_path)
         if not segments:
             self.transcript_display.setHtml("<p>No transcription available.</p>")
             return
             
-        # Format and display transcript
-        html_segments = []
-        for segment in segments:
-            start_time = segment['start']
-            start_formatted = self.format_time(start_time)
-            end_time = segment['end']
-            end_formatted = self.format_time(end_time)
-            text = segment['text']
-
-            # Create clickable transcript with download button
-            html_segment = (
-                f'<p>'
-                f'<a href="seek:{start_time}">[{start_formatted} - {end_formatted}]</a> '
-                f'<a href="download:{start_time}-{end_time}" style="margin-left:4px">&#128190;</a> '
-                f'{text}</p>'
-            )
-            html_segments.append(html_segment)
+        # Format every timestamp once; search results reuse these labels
+        starts_formatted = format_times(segments.starts)
+        ends_formatted = format_times(segments.ends)
+        time_labels = dict(zip(segments.starts.tolist(), starts_formatted))
+        time_labels.update(zip(segments.ends.tolist(), ends_formatted))
         
-        self.transcript_display.setHtml(
-            f"<h3>Transcript ({len(segments)} segments):</h3>\n" + 
-            "\n".join(html_segments)
+        # Format transcript as clickable lines with a download button
+        html_lines = [f"<h3>Transcript ({len(segments)} segments):</h3>"]
+        html_lines.extend(
+            f'<p>'
+            f'<a href="seek:{start_time}">[{start_formatted} - {end_formatted}]</a> '
+            f'<a href="download:{start_time}-{end_time}" style="margin-left:4px">&#128190;</a> '
+            f'{text}</p>'
+            for (start_time, end_time, text), start_formatted, end_formatted in zip(
+                segments.rows(), starts_formatted, ends_formatted
+            )
         )
+        
+        self._transcript_cache[self.current_video_path] = (html_lines, time_labels)
+        if len(self._transcript_cache) > TRANSCRIPT_HTML_CACHE_SIZE:
+            self._transcript_cache.popitem(last=False)
+        
+        self._render_transcript(html_lines)
         self.logger.info(f"Displayed transcript: {len(segments)} segments")
     
+    def _render_transcript(self, html_lines):
+        """Fill the transcript view in chunks within a single edit block.
+        
+        Inserting chunks through a cursor avoids parsing one huge HTML string,
+        and the edit block defers layout until all lines are in place.
+        """
+        document = self.transcript_display.document()
+        document.clear()
+        cursor = QTextCursor(document)
+        cursor.beginEditBlock()
+        try:
+            for i in range(0, len(html_lines), TRANSCRIPT_INSERT_CHUNK):
+                cursor.insertHtml("\n".join(html_lines[i:i + TRANSCRIPT_INSERT_CHUNK]))
+        finally:
+            cursor.endEditBlock()
+        self.transcript_display.moveCursor(QTextCursor.Start)
+    
     def show_error(self, title, message):
         """Show error dialog."""
         self.logger.error(f"{title}: {message}")
         QMessageBox.critical(self, title, message)
         self.statusBar().showMessage(f"Error: {message}")
     
+    def setup_ffmpeg(self, ffmpeg_manager):
+        """Download FFmpeg in the background while the window stays usable.
+        
+        Transcriptions queued in the meantime start once setup finishes.
+        """
+        self.ffmpeg_ready = False
+        self._ffmpeg_dialog = QProgressDialog("Preparing FFmpeg...", "Cancel", 0, 100, self)
+        self._ffmpeg_dialog.setWindowTitle("Initial Setup")
+        self._ffmpeg_dialog.setWindowModality(Qt.WindowModal)
+        self._ffmpeg_dialog.setAutoClose(False)
+        self._ffmpeg_dialog.setMinimumDuration(0)
+        
+        self._ffmpeg_setup = FFmpegSetupWorker(ffmpeg_manager)
+        self._ffmpeg_setup.progress.connect(self._ffmpeg_setup_progress)
+        self._ffmpeg_setup.done.connect(self._ffmpeg_setup_finished)
+        self._ffmpeg_dialog.canceled.connect(self._ffmpeg_setup.requestInterruption)
+        self._ffmpeg_setup.start()
+    
+    def _ffmpeg_setup_progress(self, percentage, message):
+        """Show FFmpeg download progress."""
+        if not self._ffmpeg_dialog.wasCanceled():
+            self._ffmpeg_dialog.setValue(percentage)
+            self._ffmpeg_dialog.setLabelText(message)
+    
+    def _ffmpeg_setup_finished(self, available):
+        """Close the setup dialog and start transcriptions queued meanwhile."""
+        self._ffmpeg_dialog.close()
+        self._ffmpeg_setup.wait()
+        verification_warning = self._ffmpeg_setup.ffmpeg_manager.verification_warning
+        self._ffmpeg_setup = None
+        self.ffmpeg_ready = True
+        
+        if not available:
+            msg = QMessageBox(self)
+            msg.setIcon(QMessageBox.Warning)
+            msg.setWindowTitle("FFmpeg Setup")
+            msg.setText("FFmpeg could not be downloaded automatically.")
+            msg.setInformativeText("Please install FFmpeg manually or check your internet connection.")
+            msg.exec()
+        else:
+            if verification_warning:
+                QMessageBox.warning(self, "FFmpeg Setup", verification_warning)
+            self.start_model_warmup()
+        
+        self.start_pending_tasks()
+    
+    def _stop_ffmpeg_setup(self):
+        """Abort a running FFmpeg download before the application exits."""
+        if self._ffmpeg_setup is not None:
+            self._ffmpeg_setup.requestInterruption()
+            self._ffmpeg_setup.wait()
+    
     def closeEvent(self, event):
         """Handle application close event."""
-        running_workers = [w for w in self.workers.values() if w.isRunning()]
+        running_workers = list(self.workers.values())
         if running_workers:
             reply = QMessageBox.question(
                 self,
@@ -803,11 +1253,19 @@ class MainWindow(QMainWindow):
             )
 
             if reply == QMessageBox.Yes:
+                self.pending_tasks.clear()
                 for w in running_workers:
-                    w.terminate()
-                    w.wait()
+                    w.cancel()
+                # Kill FFmpeg and the Whisper process so blocked workers return promptly
+                self.controller.cancel()
+                if not self.worker_pool.waitForDone(WORKER_CANCEL_TIMEOUT_MS):
+                    self.logger.warning("Transcription workers did not stop in time")
+                self._stop_ffmpeg_setup()
+                self.controller.shutdown()
                 event.accept()
             else:
                 event.ignore()
         else:
+            self._stop_ffmpeg_setup()
+            self.controller.shutdown()
             event.accept()
@@ -3,7 +3,6 @@ Video player widget for the transcription application.
 """
 
 import os
-from pathlib import Path
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
                               QSlider, QLabel, QSizePolicy)
 from PySide6.QtCore import Qt, QUrl, QTimer, Signal
@@ -13,10 +12,23 @@ from PySide6.QtGui import QIcon
 
 from utils.logger import get_logger
 
+# Milliseconds over which slider drags are coalesced into one seek
+SEEK_COALESCE_INTERVAL_MS = 30
+
+# Milliseconds between position label/slider refreshes during playback (~15 Hz)
+POSITION_REFRESH_INTERVAL_MS = 66
+
+# Zero-padded two-digit strings for building HH:MM:SS labels without format()
+_TWO_DIGITS = tuple(f"{i:02d}" for i in range(100))
+
+# Playback rates offered by the speed button, with their labels
+SPEED_OPTIONS = ((0.5, "0.5x"), (0.75, "0.75x"), (1.0, "1.0x"), (1.25, "1.25x"), (1.5, "1.5x"), (2.0, "2.0x"))
+
 class VideoPlayer(QWidget):
     """Custom video player widget with playback controls."""
     
     position_changed = Signal(int)  # Emitted when position changes
+    media_error = Signal(str)  # Emitted when the player fails to load or play media
     
     def __init__(self):
         super().__init__()
@@ -106,11 +118,20 @@ class VideoPlayer(QWidget):
         self.media_player.setVideoOutput(self.video_widget)
         self.media_player.setAudioOutput(self.audio_output)
         
+        # Media duration, kept from durationChanged instead of querying the backend
+        self._duration_ms = 0
+        
+        # Position updates are cached and shown at POSITION_REFRESH_INTERVAL_MS
+        self._last_position_ms = 0
+        self._shown_position_ms = None
+        self._ui_timer = QTimer(self)
+        self._ui_timer.setInterval(POSITION_REFRESH_INTERVAL_MS)
+        self._ui_timer.timeout.connect(self._refresh_position)
+        
         # Connect signals
         self.connect_signals()
         
         # Speed options
-        self.speed_options = [0.5, 0.75, 1.0, 1.25, 1.5, 2.0]
         self.current_speed_index = 2  # 1.0x
         
     def connect_signals(self):
@@ -131,7 +152,7 @@ class VideoPlayer(QWidget):
         
         self.position_slider.sliderPressed.connect(self.slider_pressed)
         self.position_slider.sliderReleased.connect(self.slider_released)
-        self.position_slider.valueChanged.connect(self.set_position)
+        self.position_slider.sliderMoved.connect(self.set_position)
         
         self.volume_slider.valueChanged.connect(self.set_volume)
         self.speed_button.clicked.connect(self.cycle_speed)
@@ -139,17 +160,28 @@ class VideoPlayer(QWidget):
         # Internal state
         self.slider_pressed_flag = False
         
+        # Seeks requested while dragging are applied at most once per interval
+        self._pending_position = None
+        self._seek_timer = QTimer(self)
+        self._seek_timer.setSingleShot(True)
+        self._seek_timer.setInterval(SEEK_COALESCE_INTERVAL_MS)
+        self._seek_timer.timeout.connect(self._flush_seek)
+        
     def load_video(self, file_path):
         """Load a video file."""
         try:
-            if not os.path.exists(file_path):
-                raise FileNotFoundError(f"Video file not found: {file_path}")
+            # No existence check here: a missing or unreadable file is
+            # reported asynchronously through errorOccurred -> media_error
             
             # Преобразуем путь в абсолютный URL формат для Qt
-            url = QUrl.fromLocalFile(str(Path(file_path).resolve()))
+            # abspath is enough for Qt and, unlike resolve(), does not stat every parent directory
+            url = QUrl.fromLocalFile(os.path.abspath(file_path))
             self.media_player.stop()  # Остановить текущее воспроизведение перед загрузкой нового
             
             # Reset controls
+            self._last_position_ms = 0
+            self._duration_ms = 0
+            self._shown_position_ms = None
             self.position_slider.setValue(0)
             self.position_label.setText("00:00:00")
             self.duration_label.setText("00:00:00")
@@ -180,39 +212,61 @@ class VideoPlayer(QWidget):
     
     def seek_to_time(self, seconds):
         """Seek to a specific time in seconds."""
-        if self.media_player.duration() > 0:
+        if self._duration_ms > 0:
             position_ms = int(seconds * 1000)
             self.media_player.setPosition(position_ms)
             self.logger.info(f"Seeking to {seconds:.2f} seconds")
     
     def update_position(self, position_ms):
-        """Update position slider and label."""
-        if not self.slider_pressed_flag:
-            if self.media_player.duration() > 0:
-                progress = int((position_ms / self.media_player.duration()) * 100)
-                self.position_slider.setValue(progress)
-            
-            self.position_label.setText(self.ms_to_time_string(position_ms))
-            self.position_changed.emit(position_ms)
+        """Record the player position; the UI picks it up on the next refresh."""
+        self._last_position_ms = position_ms
+        # Outside playback the refresh timer is idle, so seeks are shown right away
+        if not self._ui_timer.isActive():
+            self._refresh_position()
+    
+    def _refresh_position(self):
+        """Update position slider and label if the position changed."""
+        position_ms = self._last_position_ms
+        if self.slider_pressed_flag or position_ms == self._shown_position_ms:
+            return
+        self._shown_position_ms = position_ms
+        
+        if self._duration_ms > 0:
+            progress = int((position_ms / self._duration_ms) * 100)
+            self.position_slider.setValue(progress)
+        
+        # The label only changes once per second
+        position_text = self.ms_to_time_string(position_ms)
+        if position_text != self.position_label.text():
+            self.position_label.setText(position_text)
+        self.position_changed.emit(position_ms)
+    
+    @property
+    def duration_ms(self):
+        """Duration of the loaded media in milliseconds, or 0 while it is unknown."""
+        return self._duration_ms
     
     def update_duration(self, duration_ms):
         """Update duration label when media is loaded."""
+        self._duration_ms = duration_ms
         self.duration_label.setText(self.ms_to_time_string(duration_ms))
     
     def update_playback_state(self, state):
         """Update button states based on playback state."""
         if state == QMediaPlayer.PlayingState:
+            self._ui_timer.start()
             self.play_button.setEnabled(False)
             self.pause_button.setEnabled(True)
             self.stop_button.setEnabled(True)
-        elif state == QMediaPlayer.PausedState:
-            self.play_button.setEnabled(True)
-            self.pause_button.setEnabled(False)
-            self.stop_button.setEnabled(True)
-        else:  # StoppedState
-            self.play_button.setEnabled(True)
-            self.pause_button.setEnabled(False)
-            self.stop_button.setEnabled(False)
+            return
+        
+        # Not playing: stop polling and show where playback ended up
+        self._ui_timer.stop()
+        self._refresh_position()
+        self.play_button.setEnabled(True)
+        self.pause_button.setEnabled(False)
+        # Stop stays available while paused
+        self.stop_button.setEnabled(state == QMediaPlayer.PausedState)
     
     def slider_pressed(self):
         """Handle slider press event."""
@@ -221,12 +275,23 @@ class VideoPlayer(QWidget):
     def slider_released(self):
         """Handle slider release event."""
         self.slider_pressed_flag = False
+        # Seek to the final position right away
+        self.set_position(self.position_slider.value())
+        self._seek_timer.stop()
+        self._flush_seek()
     
     def set_position(self, progress):
-        """Set player position from slider."""
-        if self.slider_pressed_flag and self.media_player.duration() > 0:
-            position_ms = int((progress / 100) * self.media_player.duration())
-            self.media_player.setPosition(position_ms)
+        """Request a seek from the slider; drags are coalesced into one seek per interval."""
+        if self._duration_ms > 0:
+            self._pending_position = int((progress / 100) * self._duration_ms)
+            if not self._seek_timer.isActive():
+                self._seek_timer.start()
+    
+    def _flush_seek(self):
+        """Apply the latest requested seek, if any."""
+        if self._pending_position is not None:
+            self.media_player.setPosition(self._pending_position)
+            self._pending_position = None
     
     def set_volume(self, volume):
         """Set audio volume."""
@@ -234,24 +299,24 @@ class VideoPlayer(QWidget):
     
     def cycle_speed(self):
         """Cycle through playback speeds."""
-        self.current_speed_index = (self.current_speed_index + 1) % len(self.speed_options)
-        speed = self.speed_options[self.current_speed_index]
+        self.current_speed_index = (self.current_speed_index + 1) % len(SPEED_OPTIONS)
+        speed, label = SPEED_OPTIONS[self.current_speed_index]
         self.media_player.setPlaybackRate(speed)
-        self.speed_button.setText(f"{speed}x")
+        self.speed_button.setText(label)
     
     def ms_to_time_string(self, ms):
         """Convert milliseconds to HH:MM:SS format."""
-        seconds = ms // 1000
-        hours = seconds // 3600
-        minutes = (seconds % 3600) // 60
-        seconds = seconds % 60
+        hours, seconds = divmod(ms // 1000, 3600)
+        minutes, seconds = divmod(seconds, 60)
+        if hours < 100:
+            return _TWO_DIGITS[hours] + ":" + _TWO_DIGITS[minutes] + ":" + _TWO_DIGITS[seconds]
         return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
         
     def handle_error(self, error, error_string):
         """Handle media player errors."""
         if error != QMediaPlayer.NoError:
             self.logger.error(f"Media player error: {error_string} (code: {error})")
-            # Можно добавить диалоговое окно с ошибкой при необходимости
+            self.media_error.emit(error_string)
             
     def handle_media_status(self, status):
         """Handle media status changes."""
@@ -6,13 +6,16 @@ Main entry point for the desktop application.
 
 import sys
 import os
+import importlib.util
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add the current directory to Python path
 current_dir = Path(__file__).parent
 sys.path.insert(0, str(current_dir))
 
-from PySide6.QtWidgets import QApplication, QMessageBox, QProgressDialog
+from PySide6.QtWidgets import QApplication, QMessageBox
 from PySide6.QtCore import QDir, Qt
 from gui.main_window import MainWindow
 from utils.logger import setup_logger
@@ -23,30 +26,15 @@ def check_dependencies():
     """Check if required dependencies are available."""
     missing_deps = []
     
-    try:
-        import whisper
-    except ImportError:
+    # find_spec only locates the packages; importing whisper here would load
+    # torch and delay startup by seconds before the window appears
+    if importlib.util.find_spec("whisper") is None and importlib.util.find_spec("faster_whisper") is None:
         missing_deps.append("whisper")
     
-    try:
-        import ffmpeg
-    except ImportError:
+    if importlib.util.find_spec("ffmpeg") is None:
         missing_deps.append("ffmpeg-python")
     
-    # Check if FFmpeg is available (will be auto-downloaded if needed)
-    try:
-        ffmpeg_manager = FFmpegManager()
-        if not ffmpeg_manager.is_ffmpeg_available():
-            # FFmpeg will be downloaded automatically when needed
-            pass
-    except Exception:
-        # FFmpeg issues will be handled during runtime
-        pass
-    
-    try:
-        import pysubs2
-    except ImportError:
-        missing_deps.append("pysubs2")
+    # The FFmpeg binary itself is checked (and downloaded if needed) in main()
     
     if missing_deps:
         return missing_deps
@@ -59,17 +47,25 @@ def main():
     logger = setup_logger()
     logger.info("Starting Offline Video Transcriber & Searcher")
     
-    # Create QApplication
-    app = QApplication(sys.argv)
-    app.setApplicationName("Video Transcriber")
-    app.setApplicationVersion("1.0.0")
-    app.setOrganizationName("VideoTranscriber")
+    # Probe dependencies and the FFmpeg binary while Qt initializes; both
+    # are file system/subprocess checks that don't touch Qt
+    ffmpeg_manager = FFmpegManager()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        dependencies_future = executor.submit(check_dependencies)
+        ffmpeg_future = executor.submit(ffmpeg_manager.is_ffmpeg_available)
     
-    # Set application properties
-    app.setQuitOnLastWindowClosed(True)
+        # Create QApplication
+        app = QApplication(sys.argv)
+        app.setApplicationName("Video Transcriber")
+        app.setApplicationVersion("1.0.0")
+        app.setOrganizationName("VideoTranscriber")
+        
+        # Set application properties
+        app.setQuitOnLastWindowClosed(True)
+        
+        # Check dependencies
+        missing_deps = dependencies_future.result()
     
-    # Check dependencies
-    missing_deps = check_dependencies()
     if missing_deps:
         msg = QMessageBox()
         msg.setIcon(QMessageBox.Critical)
@@ -80,38 +76,14 @@ def main():
         return 1
     
     try:
-        # Check and setup FFmpeg
-        ffmpeg_manager = FFmpegManager()
-        if not ffmpeg_manager.is_ffmpeg_available():
-            # Show download dialog
-            progress_dialog = QProgressDialog("Preparing FFmpeg...", "Cancel", 0, 100)
-            progress_dialog.setWindowTitle("Initial Setup")
-            progress_dialog.setWindowModality(Qt.ApplicationModal)
-            progress_dialog.show()
-            
-            def ffmpeg_progress_callback(percentage, message):
-                progress_dialog.setValue(percentage)
-                progress_dialog.setLabelText(message)
-                app.processEvents()
-                
-                if progress_dialog.wasCanceled():
-                    return False
-                return True
-            
-            if not ffmpeg_manager.ensure_ffmpeg(ffmpeg_progress_callback):
-                msg = QMessageBox()
-                msg.setIcon(QMessageBox.Warning)
-                msg.setWindowTitle("FFmpeg Setup")
-                msg.setText("FFmpeg could not be downloaded automatically.")
-                msg.setInformativeText("Please install FFmpeg manually or check your internet connection.")
-                msg.exec()
-            
-            progress_dialog.close()
-        
         # Create and show main window
         main_window = MainWindow()
         main_window.show()
         
+        # Download FFmpeg in the background if needed; the window opens right away
+        if not ffmpeg_future.result():
+            main_window.setup_ffmpeg(ffmpeg_manager)
+        
         # Логирование после этого момента будет идти через Qt консоль
         
         # Run the application
@@ -128,4 +100,6 @@ def main():
         return 1
 
 if __name__ == "__main__":
+    # Frozen Windows builds re-run this script for the Whisper worker process
+    multiprocessing.freeze_support()
     sys.exit(main())
@@ -2,16 +2,65 @@
 Audio extraction module using FFmpeg.
 """
 
+import functools
 import os
-import time
 import tempfile
+import threading
+import struct
+import subprocess
 import ffmpeg
+import numpy as np
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 
+from modules.wavfile import read_wav_header, map_samples
 from utils.logger import get_logger
 from utils.ffmpeg_downloader import FFmpegManager
 
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows
+    fcntl = None
+
+# Sample rate Whisper expects
+SAMPLE_RATE = 16000
+
+# Options for every FFmpeg run: no banner or progress chatter on stderr, and no
+# reading from stdin, which would block a process started without a console
+FFMPEG_GLOBAL_ARGS = ('-hide_banner', '-nostdin', '-loglevel', 'error')
+
+# Size of a canonical WAV header; a file this small holds no audio
+WAV_HEADER_SIZE = 44
+
+# Write buffer for segment WAV files
+WAV_WRITE_BUFFER_SIZE = 1 << 20
+
+# Kernel capacity of FFmpeg's stdout pipe where the OS allows resizing it, so
+# FFmpeg blocks less often on a full pipe than with the default 64 KB
+FFMPEG_PIPE_BUFFER_SIZE = 1 << 20
+
+# Limit on simultaneous FFmpeg extractions to avoid disk thrashing
+MAX_CONCURRENT_EXTRACTIONS = 2
+_extraction_slots = threading.BoundedSemaphore(MAX_CONCURRENT_EXTRACTIONS)
+
+# RAM-backed directory for extracted WAVs on Linux; the file is only read back
+# by the transcriber, so it never needs to reach the disk
+RAM_DISK_DIR = "/dev/shm"
+
+# Free space RAM_DISK_DIR must have before it is used: about 18 hours of
+# 16 kHz mono 16-bit audio, so no probe of the video is needed to decide
+RAM_DISK_MIN_FREE = 2 << 30
+
+# Number of ffprobe results kept in memory
+PROBE_CACHE_SIZE = 256
+
+@functools.lru_cache(maxsize=PROBE_CACHE_SIZE)
+def _probe(video_path: str, mtime_ns: int, size: int) -> dict:
+    """Run ffprobe once per file version; mtime and size are part of the cache key."""
+    return ffmpeg.probe(video_path)
+
 class AudioExtractor:
     """Extract audio from video files using FFmpeg."""
     
@@ -19,14 +68,50 @@ class AudioExtractor:
         self.logger = get_logger()
         self.temp_files = []
         self.ffmpeg_manager = FFmpegManager()
+        self._executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_EXTRACTIONS,
+                                            thread_name_prefix="extract")
+        # FFmpeg child processes currently running, so they can be killed on cancel
+        self._processes = set()
+        self._processes_lock = threading.Lock()
+        # FFmpeg executable, resolved by the first extraction
+        self._ffmpeg_path = None
+        self._ffmpeg_lock = threading.Lock()
+        # Last fully decoded video, ((path, mtime, size), samples), for cutting segments
+        self._decoded = None
+        self._decoded_lock = threading.Lock()
+    
+    def extract_async(self, video_path: str, output_dir: Optional[str] = None, progress_callback=None) -> Future:
+        """
+        Start audio extraction in the background.
+        
+        Args:
+            video_path: Path to input video file
+            output_dir: Directory for output file (default: temp directory)
+            
+        Returns:
+            Future resolving to the path of the extracted audio file
+        """
+        return self._executor.submit(self.extract, video_path, output_dir, progress_callback)
     
-    def extract(self, video_path: str, output_dir: Optional[str] = None, progress_callback=None) -> str:
+    def extract_to_array_async(self, video_path: str, progress_callback=None) -> Future:
+        """
+        Start decoding audio into memory in the background.
+        
+        Returns:
+            Future resolving to the 16 kHz mono int16 samples
+        """
+        return self._executor.submit(self.extract_to_array, video_path, progress_callback)
+    
+    def extract(self, video_path: str, output_dir: Optional[str] = None, progress_callback=None,
+                use_ram_disk: bool = True) -> str:
         """
         Extract audio from video file.
         
         Args:
             video_path: Path to input video file
             output_dir: Directory for output file (default: temp directory)
+            use_ram_disk: Without output_dir, write to a RAM-backed tmpfs when one
+                has room for the file
             
         Returns:
             Path to extracted audio file
@@ -36,7 +121,9 @@ class AudioExtractor:
         
         # Determine output path
         if output_dir is None:
-            output_dir = tempfile.gettempdir()
+            output_dir = self._ram_disk_dir() if use_ram_disk else None
+            if output_dir is None:
+                output_dir = tempfile.gettempdir()
         
         video_name = Path(video_path).stem
         audio_path = os.path.join(output_dir, f"{video_name}_audio.wav")
@@ -49,17 +136,13 @@ class AudioExtractor:
             if progress_callback:
                 progress_callback(0, "Checking FFmpeg...")
             
-            if not self.ffmpeg_manager.ensure_ffmpeg(progress_callback):
-                raise RuntimeError("FFmpeg is not available and could not be downloaded")
+            ffmpeg_path = self._require_ffmpeg(progress_callback)
             
             if progress_callback:
                 progress_callback(20, "Starting audio extraction...")
             
             self.logger.info(f"Extracting audio: {video_path} -> {audio_path}")
             
-            # Get FFmpeg path
-            ffmpeg_path = self.ffmpeg_manager.get_ffmpeg_path()
-            
             # Use FFmpeg to extract audio
             # Convert to mono WAV at 16kHz for optimal speech recognition
             stream = ffmpeg.input(video_path)
@@ -69,39 +152,23 @@ class AudioExtractor:
                 acodec='pcm_s16le',  # 16-bit PCM
                 ac=1,                # Mono channel
                 ar=16000,           # 16kHz sample rate
+                vn=None,            # Skip video decoding
+                threads=0,          # Let FFmpeg pick the thread count
                 y=None              # Overwrite output file
-            )
+            ).global_args(*FFMPEG_GLOBAL_ARGS)
             
             # Run the extraction with custom FFmpeg path
             if progress_callback:
                 progress_callback(50, "Processing audio...")
             
-            ffmpeg.run(stream, cmd=ffmpeg_path, capture_stdout=True, capture_stderr=True)
+            # Wait for a free slot so parallel workers don't thrash the disk
+            with _extraction_slots:
+                self._run_ffmpeg(stream, ffmpeg_path)
         
-            if not os.path.exists(audio_path):
+            # FFmpeg has exited and closed the file once communicate() returns,
+            # so a single size check is enough; anything beyond the header is audio
+            if not os.path.exists(audio_path) or os.path.getsize(audio_path) <= WAV_HEADER_SIZE:
                 raise RuntimeError("Audio extraction failed - output file not created")
-            
-            # Ensure file is fully written and accessible
-            retry_count = 0
-            max_retries = 3
-            while retry_count < max_retries:
-                try:
-                    file_size = os.path.getsize(audio_path)
-                    if file_size > 0:
-                        # Try to open the file to verify it's readable
-                        with open(audio_path, 'rb') as f:
-                            # Read a small chunk to ensure file is readable
-                            f.read(1024)
-                            break
-                except Exception as e:
-                    self.logger.warning(f"File not fully accessible yet: {str(e)}")
-                
-                # Wait before retrying
-                time.sleep(1)
-                retry_count += 1
-            
-            if retry_count == max_retries:
-                self.logger.warning("File access verification timed out, but continuing anyway")
         
             self.logger.info(f"Audio extraction completed: {audio_path}")
             return audio_path
@@ -115,10 +182,140 @@ class AudioExtractor:
             self.logger.error(error_msg)
             raise RuntimeError(error_msg)
     
+    def extract_to_array(self, video_path: str, progress_callback=None) -> np.ndarray:
+        """
+        Decode a video's audio straight into memory, without a temporary file.
+        
+        FFmpeg writes raw 16 kHz mono 16-bit PCM to a pipe, which saves the
+        write and read-back of a WAV file.
+        
+        Args:
+            video_path: Path to input video file
+            
+        Returns:
+            int16 array of samples at SAMPLE_RATE
+        """
+        if not os.path.exists(video_path):
+            raise FileNotFoundError(f"Video file not found: {video_path}")
+        
+        try:
+            header = read_wav_header(video_path)
+            if (header is not None and header.sample_rate == SAMPLE_RATE
+                    and header.channels == 1 and header.sample_width == 2):
+                # Already what Whisper takes; copy the samples out without FFmpeg
+                self.logger.info(f"Reading 16 kHz mono WAV directly: {video_path}")
+                samples = np.array(map_samples(video_path, header))
+                if samples.size == 0:
+                    raise RuntimeError("Audio extraction failed - no audio decoded")
+                return samples
+            
+            if progress_callback:
+                progress_callback(0, "Checking FFmpeg...")
+            
+            ffmpeg_path = self._require_ffmpeg(progress_callback)
+            
+            if progress_callback:
+                progress_callback(50, "Processing audio...")
+            
+            self.logger.info(f"Decoding audio to memory: {video_path}")
+            stream = ffmpeg.input(video_path)
+            stream = ffmpeg.output(stream.audio, 'pipe:', format='s16le', acodec='pcm_s16le',
+                                   ac=1, ar=SAMPLE_RATE, vn=None, threads=0)
+            stream = stream.global_args(*FFMPEG_GLOBAL_ARGS)
+            
+            with _extraction_slots:
+                pcm = self._run_ffmpeg(stream, ffmpeg_path)
+            
+            samples = np.frombuffer(pcm, dtype=np.int16)
+            if samples.size == 0:
+                raise RuntimeError("Audio extraction failed - no audio decoded")
+            
+            self.logger.info(f"Audio decoded: {samples.size / SAMPLE_RATE:.1f}s")
+            return samples
+            
+        except ffmpeg.Error as e:
+            error_msg = f"FFmpeg error during audio extraction: {e.stderr.decode() if e.stderr else str(e)}"
+            self.logger.error(error_msg)
+            raise RuntimeError(error_msg)
+        except Exception as e:
+            error_msg = f"Audio extraction failed: {str(e)}"
+            self.logger.error(error_msg)
+            raise RuntimeError(error_msg)
+    
+    def _ram_disk_dir(self) -> Optional[str]:
+        """Return RAM_DISK_DIR if it exists and has at least RAM_DISK_MIN_FREE bytes free."""
+        if not os.path.isdir(RAM_DISK_DIR) or not os.access(RAM_DISK_DIR, os.W_OK):
+            return None
+        
+        stat = os.statvfs(RAM_DISK_DIR)
+        if stat.f_bavail * stat.f_frsize < RAM_DISK_MIN_FREE:
+            return None
+        return RAM_DISK_DIR
+    
+    def _require_ffmpeg(self, progress_callback=None) -> str:
+        """Return the FFmpeg executable, making sure it is available on the first call only.
+        
+        ensure_ffmpeg runs `ffmpeg -version`, which is not worth repeating for
+        every extraction once FFmpeg has been found.
+        """
+        with self._ffmpeg_lock:
+            if self._ffmpeg_path is None:
+                if not self.ffmpeg_manager.ensure_ffmpeg(progress_callback):
+                    raise RuntimeError("FFmpeg is not available and could not be downloaded")
+                self._ffmpeg_path = self.ffmpeg_manager.get_ffmpeg_path()
+            return self._ffmpeg_path
+    
+    def _run_ffmpeg(self, stream, ffmpeg_path: str) -> bytes:
+        """Run an FFmpeg command like ffmpeg.run, keeping the process killable.
+        
+        Returns:
+            Everything FFmpeg wrote to stdout
+        """
+        process = subprocess.Popen(
+            ffmpeg.compile(stream, cmd=ffmpeg_path),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        if fcntl is not None and hasattr(fcntl, 'F_SETPIPE_SZ'):
+            try:
+                fcntl.fcntl(process.stdout.fileno(), fcntl.F_SETPIPE_SZ, FFMPEG_PIPE_BUFFER_SIZE)
+            except OSError:
+                # Above the system limit (/proc/sys/fs/pipe-max-size); keep the default
+                pass
+        with self._processes_lock:
+            self._processes.add(process)
+        try:
+            out, err = process.communicate()
+        finally:
+            with self._processes_lock:
+                self._processes.discard(process)
+        
+        if process.returncode != 0:
+            raise ffmpeg.Error('ffmpeg', out, err)
+        return out
+    
+    def kill_running(self):
+        """Kill all running FFmpeg extractions; their extract calls fail."""
+        with self._processes_lock:
+            processes = list(self._processes)
+        for process in processes:
+            try:
+                process.kill()
+            except OSError:
+                pass
+        if processes:
+            self.logger.info(f"Killed {len(processes)} running FFmpeg process(es)")
+    
+    def probe(self, video_path: str) -> dict:
+        """Return ffprobe output for a video, cached until the file changes."""
+        stat = os.stat(video_path)
+        return _probe(video_path, stat.st_mtime_ns, stat.st_size)
+    
     def get_audio_info(self, video_path: str) -> dict:
         """Get audio stream information from video file."""
         try:
-            probe = ffmpeg.probe(video_path)
+            probe = self.probe(video_path)
             audio_streams = [
                 stream for stream in probe['streams'] 
                 if stream['codec_type'] == 'audio'
@@ -129,12 +326,15 @@ class AudioExtractor:
             
             audio_stream = audio_streams[0]  # Use first audio stream
             
+            # Matroska and WebM streams carry no duration of their own
+            duration = audio_stream.get('duration') or probe.get('format', {}).get('duration', 0)
+            
             info = {
                 'has_audio': True,
                 'codec': audio_stream.get('codec_name', 'unknown'),
                 'sample_rate': int(audio_stream.get('sample_rate', 0)),
                 'channels': int(audio_stream.get('channels', 0)),
-                'duration': float(audio_stream.get('duration', 0))
+                'duration': float(duration)
             }
             
             return info
@@ -143,13 +343,22 @@ class AudioExtractor:
             self.logger.error(f"Failed to get audio info: {str(e)}")
             return {'has_audio': False, 'error': str(e)}
     
+    def _is_whisper_pcm(self, video_path: str) -> bool:
+        """Check whether the file is a 16-bit mono PCM WAV at the Whisper sample rate.
+        
+        The header is read directly, so no ffprobe is needed.
+        """
+        header = read_wav_header(video_path)
+        return (header is not None and header.sample_rate == SAMPLE_RATE
+                and header.channels == 1 and header.sample_width == 2)
+    
     def validate_video_file(self, video_path: str) -> bool:
         """Validate if the file is a readable video with audio."""
         try:
             if not os.path.exists(video_path):
                 return False
             
-            probe = ffmpeg.probe(video_path)
+            probe = self.probe(video_path)
             
             # Check for video stream
             has_video = any(
@@ -169,6 +378,18 @@ class AudioExtractor:
             self.logger.error(f"Video validation failed: {str(e)}")
             return False
     
+    def remove(self, audio_path: str):
+        """Delete a single extracted audio file as soon as it is no longer needed."""
+        try:
+            if os.path.exists(audio_path):
+                os.remove(audio_path)
+                self.logger.debug(f"Removed temp file: {audio_path}")
+        except Exception as e:
+            self.logger.error(f"Failed to remove temp file {audio_path}: {str(e)}")
+        
+        if audio_path in self.temp_files:
+            self.temp_files.remove(audio_path)
+    
     def cleanup(self):
         """Clean up temporary audio files."""
         for temp_file in self.temp_files:
@@ -199,24 +420,34 @@ class AudioExtractor:
         if end <= start:
             raise ValueError("End time must be greater than start time")
 
-        # Ensure FFmpeg is available
-        if not self.ffmpeg_manager.ensure_ffmpeg():
-            raise RuntimeError("FFmpeg is not available and could not be downloaded")
+        # Slice the already decoded audio instead of decoding the file again
+        samples = self._decoded_audio(video_path, decode=False)
+        if samples is not None:
+            self._write_wav(samples[int(start * SAMPLE_RATE):int(end * SAMPLE_RATE)], output_path)
+            return output_path
 
-        ffmpeg_path = self.ffmpeg_manager.get_ffmpeg_path()
+        ffmpeg_path = self._require_ffmpeg()
 
         try:
+            # Seeking on the input side jumps to the nearest keyframe instead of
+            # decoding everything before the segment
             stream = ffmpeg.input(video_path, ss=start, to=end)
+            if self._is_whisper_pcm(video_path):
+                # The audio is already in the target format: copy the samples
+                # instead of decoding and re-encoding them
+                codec_args = {'acodec': 'copy'}
+            else:
+                codec_args = {'acodec': 'pcm_s16le', 'ac': 1, 'ar': 16000}
             stream = ffmpeg.output(
                 stream.audio,
                 output_path,
-                acodec='pcm_s16le',
-                ac=1,
-                ar=16000,
-                y=None
-            )
+                vn=None,
+                threads=0,
+                y=None,
+                **codec_args
+            ).global_args(*FFMPEG_GLOBAL_ARGS)
 
-            ffmpeg.run(stream, cmd=ffmpeg_path, capture_stdout=True, capture_stderr=True)
+            self._run_ffmpeg(stream, ffmpeg_path)
 
             if not os.path.exists(output_path):
                 raise RuntimeError("Segment extraction failed - output file not created")
@@ -230,3 +461,60 @@ class AudioExtractor:
         except Exception as e:
             self.logger.error(f"Segment extraction failed: {str(e)}")
             raise
+
+    def _decoded_audio(self, video_path: str, decode: bool = True) -> Optional[np.ndarray]:
+        """Return the video's decoded samples, decoding and caching them if asked to.
+
+        Only the most recent video is kept; the cache is keyed on the file's
+        modification time and size so an edited file is decoded again.
+        """
+        stat = os.stat(video_path)
+        key = (video_path, stat.st_mtime_ns, stat.st_size)
+        with self._decoded_lock:
+            if self._decoded is not None and self._decoded[0] == key:
+                return self._decoded[1]
+            if not decode:
+                return None
+            samples = self.extract_to_array(video_path)
+            self._decoded = (key, samples)
+            return samples
+
+    def _write_wav(self, samples: np.ndarray, output_path: str):
+        """Write 16 kHz mono int16 samples as a WAV file."""
+        samples = np.ascontiguousarray(samples, dtype='<i2')
+        data_size = samples.nbytes
+        # RIFF header for 16-bit mono PCM, written up front since the size is known
+        header = struct.pack(
+            '<4sI4s4sIHHIIHH4sI',
+            b'RIFF', WAV_HEADER_SIZE - 8 + data_size, b'WAVE',
+            b'fmt ', 16, 1, 1, SAMPLE_RATE, SAMPLE_RATE * 2, 2, 16,
+            b'data', data_size
+        )
+        with open(output_path, 'wb', buffering=WAV_WRITE_BUFFER_SIZE) as wav_file:
+            wav_file.write(header)
+            # The slice is written straight from the array without a bytes copy
+            wav_file.write(memoryview(samples).cast('B'))
+
+    def extract_segments(self, video_path: str, spans: List[Tuple[float, float, str]]) -> List[str]:
+        """Extract several audio segments from a video in parallel.
+
+        For more than one span the audio is decoded once and every segment
+        is sliced from memory; the writes run side by side on threads.
+
+        Args:
+            video_path: Path to the source video file.
+            spans: (start, end, output_path) tuples.
+
+        Returns:
+            Paths to the extracted segments, in the order of spans.
+        """
+        if not spans:
+            return []
+
+        if len(spans) > 1:
+            # Decode once; every span is then cut from memory
+            self._decoded_audio(video_path)
+
+        max_workers = min(len(spans), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="segment") as executor:
+            return list(executor.map(lambda span: self.extract_segment(video_path, *span), spans))
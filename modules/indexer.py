@@ -3,14 +3,70 @@ Database indexing module for searchable transcriptions using SQLite FTS5.
 """
 
 import os
+import functools
 import sqlite3
 import json
+import hashlib
+import threading
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional, Tuple, Union
 
+from modules.segments import SegmentTable, iter_rows
 from utils.logger import get_logger
 from utils.config import get_app_data_dir
 
+# Bump when the FTS table definition changes; older databases are migrated
+# by recreating the FTS table and rebuilding it from the segments table.
+SCHEMA_VERSION = 3
+
+# The trigram tokenizer cannot match queries shorter than three characters
+MIN_TRIGRAM_QUERY_LENGTH = 3
+
+# Per-connection settings: keep temporary b-trees in memory, map up to 256 MB
+# of the file and allow a 64 MB page cache (negative values are KiB).
+# synchronous=NORMAL is safe in WAL mode and only fsyncs at checkpoints.
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+# Number of segment rows handed to a single executemany call
+INSERT_BATCH_SIZE = 5000
+
+# Number of streamed segment rows committed per transaction
+STREAM_BATCH_SIZE = 256
+
+# Number of search results kept in memory for repeated queries
+SEARCH_CACHE_SIZE = 512
+
+# Maximum number of bound parameters used in a single IN (...) lookup
+MAX_QUERY_PARAMS = 900
+
+# Bytes hashed from each end of a video to fingerprint its content
+FINGERPRINT_CHUNK_SIZE = 1024 * 1024
+
+def file_fingerprint(path: str) -> Optional[str]:
+    """
+    Fingerprint a file from its size and its first and last megabyte.
+    
+    Returns:
+        Hex digest, or None if the file cannot be read
+    """
+    try:
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            digest = hashlib.blake2b(size.to_bytes(8, "little"), digest_size=16)
+            digest.update(f.read(FINGERPRINT_CHUNK_SIZE))
+            if size > FINGERPRINT_CHUNK_SIZE:
+                f.seek(max(size - FINGERPRINT_CHUNK_SIZE, FINGERPRINT_CHUNK_SIZE))
+                digest.update(f.read(FINGERPRINT_CHUNK_SIZE))
+        return digest.hexdigest()
+    except OSError:
+        return None
+
 class TranscriptionIndexer:
     """Index and search transcription segments using SQLite FTS5."""
     
@@ -22,15 +78,39 @@ class TranscriptionIndexer:
             db_path = os.path.join(app_data_dir, "transcriptions.db")
         
         self.db_path = db_path
+        # One connection per thread; sqlite3 connections must not be shared across threads
+        self._local = threading.local()
+        # Serializes writers so they wait for a background VACUUM instead of
+        # failing on SQLite's busy timeout; readers are not blocked under WAL
+        self._write_lock = threading.Lock()
+        # Repeated queries are answered from memory. Writes bump the generation,
+        # which is part of the key, so results of a search that overlapped a
+        # write are never served afterwards.
+        self._generation = 0
+        self._search_cached = functools.lru_cache(maxsize=SEARCH_CACHE_SIZE)(self._search)
         self.init_database()
     
+    def _connection(self) -> sqlite3.Connection:
+        """Return the calling thread's database connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+        return conn
+    
     def init_database(self):
         """Initialize the SQLite database with FTS5 tables."""
         try:
             # Ensure directory exists
             os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
+                # WAL avoids a rollback-journal fsync per transaction; the mode
+                # is persistent, so it only needs to be set here
+                conn.execute("PRAGMA journal_mode=WAL")
+                
                 # Create videos table
                 conn.execute("""
                     CREATE TABLE IF NOT EXISTS videos (
@@ -54,35 +134,79 @@ class TranscriptionIndexer:
                     )
                 """)
                 
-                # Create FTS5 virtual table for full-text search
+                # Content fingerprint column, added to databases created before it existed
+                video_columns = [row[1] for row in conn.execute("PRAGMA table_info(videos)")]
+                if 'fingerprint' not in video_columns:
+                    conn.execute("ALTER TABLE videos ADD COLUMN fingerprint TEXT")
+                # Model and language of the transcription, so a fingerprint match
+                # is only reused for the same settings
+                if 'model' not in video_columns:
+                    conn.execute("ALTER TABLE videos ADD COLUMN model TEXT")
+                if 'language' not in video_columns:
+                    conn.execute("ALTER TABLE videos ADD COLUMN language TEXT")
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_videos_fingerprint ON videos (fingerprint)")
+                
+                # Loading a video's segments in time order and deleting them
+                # are range scans on this index instead of full table scans
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_segments_video
+                    ON segments (video_id, start_time)
+                """)
+                
+                # Finding the id range of a video's segments is two index seeks
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_segments_video_id
+                    ON segments (video_id, id)
+                """)
+                
+                schema_version = conn.execute("PRAGMA user_version").fetchone()[0]
+                if schema_version < SCHEMA_VERSION:
+                    # Drop the outdated FTS table and its triggers; they are recreated below
+                    conn.execute("DROP TRIGGER IF EXISTS segments_ai")
+                    conn.execute("DROP TRIGGER IF EXISTS segments_ad")
+                    conn.execute("DROP TRIGGER IF EXISTS segments_au")
+                    conn.execute("DROP TABLE IF EXISTS segments_fts")
+                
+                # Create FTS5 virtual table for full-text search.
+                # The trigram tokenizer gives substring matching that works for
+                # any script, not only whitespace-separated words. The unindexed
+                # columns let a search read everything it returns from the FTS row.
                 conn.execute("""
                     CREATE VIRTUAL TABLE IF NOT EXISTS segments_fts USING fts5(
                         text,
+                        video_id UNINDEXED,
+                        start_time UNINDEXED,
+                        end_time UNINDEXED,
                         content='segments',
-                        content_rowid='id'
+                        content_rowid='id',
+                        tokenize='trigram'
                     )
                 """)
                 
-                # Create triggers to keep FTS5 table in sync
-                conn.execute("""
-                    CREATE TRIGGER IF NOT EXISTS segments_ai AFTER INSERT ON segments BEGIN
-                        INSERT INTO segments_fts(rowid, text) VALUES (new.id, new.text);
-                    END;
-                """)
-                
+                # Create triggers to keep FTS5 table in sync. There is no insert
+                # trigger: the indexing methods add new rows to the FTS table
+                # with one INSERT ... SELECT per batch.
                 conn.execute("""
                     CREATE TRIGGER IF NOT EXISTS segments_ad AFTER DELETE ON segments BEGIN
-                        INSERT INTO segments_fts(segments_fts, rowid, text) VALUES('delete', old.id, old.text);
+                        INSERT INTO segments_fts(segments_fts, rowid, text, video_id, start_time, end_time)
+                        VALUES('delete', old.id, old.text, old.video_id, old.start_time, old.end_time);
                     END;
                 """)
                 
                 conn.execute("""
                     CREATE TRIGGER IF NOT EXISTS segments_au AFTER UPDATE ON segments BEGIN
-                        INSERT INTO segments_fts(segments_fts, rowid, text) VALUES('delete', old.id, old.text);
-                        INSERT INTO segments_fts(rowid, text) VALUES (new.id, new.text);
+                        INSERT INTO segments_fts(segments_fts, rowid, text, video_id, start_time, end_time)
+                        VALUES('delete', old.id, old.text, old.video_id, old.start_time, old.end_time);
+                        INSERT INTO segments_fts(rowid, text, video_id, start_time, end_time)
+                        VALUES (new.id, new.text, new.video_id, new.start_time, new.end_time);
                     END;
                 """)
                 
+                if schema_version < SCHEMA_VERSION:
+                    # Populate the new FTS table from existing segments
+                    conn.execute("INSERT INTO segments_fts(segments_fts) VALUES('rebuild')")
+                    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                
                 conn.commit()
                 
             self.logger.info(f"Database initialized: {self.db_path}")
@@ -92,43 +216,169 @@ class TranscriptionIndexer:
             self.logger.error(error_msg)
             raise RuntimeError(error_msg)
     
-    def index_video(self, video_path: str, segments: List[Dict[str, Any]]):
+    def index_video(self, video_path: str, segments: Union[SegmentTable, List[Dict[str, Any]]],
+                    model_name: Optional[str] = None, language: Optional[str] = None):
         """Index a video and its transcription segments."""
+        # Rows are produced lazily and consumed batch by batch
+        self.index_video_bulk(video_path, iter_rows(segments), model_name, language)
+    
+    def index_video_bulk(self, video_path: str, rows: Iterable[Tuple[float, float, str]],
+                         model_name: Optional[str] = None, language: Optional[str] = None):
+        """
+        Index a video from (start, end, text) rows in a single transaction.
+        
+        The write lock is held while rows are consumed, so rows should already
+        be in memory; use index_video_stream for rows that arrive over time.
+        
+        Args:
+            video_path: Path to video file
+            rows: Segment rows; rows with empty text are skipped
+            model_name: Whisper model that produced the segments, if known
+            language: Transcription language, or None for auto-detection
+        """
+        fingerprint = file_fingerprint(video_path)
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                # Remove existing entries for this video
-                self.remove_video_index(video_path)
+            with self._write_lock, self._connection() as conn:
+                # Take the write lock up front so the transaction cannot fail
+                # halfway through on a lock upgrade
+                conn.execute("BEGIN IMMEDIATE")
                 
-                # Insert video record
-                video_name = Path(video_path).name
-                video_size = os.path.getsize(video_path) if os.path.exists(video_path) else 0
+                video_id = self._upsert_video(conn, video_path, fingerprint, model_name, language)
                 
-                cursor = conn.execute(
-                    "INSERT INTO videos (path, name, size) VALUES (?, ?, ?)",
-                    (video_path, video_name, video_size)
+                # Insert segments in batches to bound the size of each executemany
+                segment_data = (
+                    (video_id, start, end, text)
+                    for start, end, text in rows if text and text.strip()
                 )
-                video_id = cursor.lastrowid
                 
-                # Insert segments
-                segment_data = [
-                    (video_id, seg['start'], seg['end'], seg['text'])
-                    for seg in segments if seg.get('text', '').strip()
-                ]
+                segment_count = 0
+                while True:
+                    batch = list(islice(segment_data, INSERT_BATCH_SIZE))
+                    if not batch:
+                        break
+                    conn.executemany(
+                        "INSERT INTO segments (video_id, start_time, end_time, text) VALUES (?, ?, ?, ?)",
+                        batch
+                    )
+                    segment_count += len(batch)
                 
-                conn.executemany(
-                    "INSERT INTO segments (video_id, start_time, end_time, text) VALUES (?, ?, ?, ?)",
-                    segment_data
-                )
+                # Index the new rows in one statement instead of a trigger per row
+                conn.execute("""
+                    INSERT INTO segments_fts(rowid, text, video_id, start_time, end_time)
+                    SELECT id, text, video_id, start_time, end_time FROM segments WHERE video_id = ?
+                """, (video_id,))
                 
                 conn.commit()
+                self._invalidate_search_cache()
                 
-            self.logger.info(f"Indexed video: {video_path} ({len(segments)} segments)")
+            self.logger.info(f"Indexed video: {video_path} ({segment_count} segments)")
             
         except Exception as e:
             error_msg = f"Video indexing failed: {str(e)}"
             self.logger.error(error_msg)
             raise RuntimeError(error_msg)
     
+    def index_video_stream(self, video_path: str, rows: Iterable[Tuple[float, float, str]],
+                           model_name: Optional[str] = None, language: Optional[str] = None):
+        """
+        Index a video from (start, end, text) rows that arrive over time.
+        
+        Rows are committed in small batches, each in its own short transaction,
+        so other writers are not blocked while the next rows are produced. If
+        the rows raise, the partially indexed video is removed again.
+        
+        Args:
+            video_path: Path to video file
+            rows: Segment rows; rows with empty text are skipped
+            model_name: Whisper model that produced the segments, if known
+            language: Transcription language, or None for auto-detection
+        """
+        fingerprint = file_fingerprint(video_path)
+        try:
+            with self._write_lock, self._connection() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                video_id = self._upsert_video(conn, video_path, fingerprint, model_name, language)
+                conn.commit()
+                self._invalidate_search_cache()
+            
+            segment_data = (
+                (video_id, start, end, text)
+                for start, end, text in rows if text and text.strip()
+            )
+            
+            segment_count = 0
+            try:
+                while True:
+                    # Wait for the next batch without holding the write lock
+                    batch = list(islice(segment_data, STREAM_BATCH_SIZE))
+                    if not batch:
+                        break
+                    self._append_segments(video_id, batch)
+                    segment_count += len(batch)
+            except BaseException:
+                self.remove_video_index(video_path)
+                raise
+            
+            self.logger.info(f"Indexed video: {video_path} ({segment_count} segments)")
+            
+        except Exception as e:
+            error_msg = f"Video indexing failed: {str(e)}"
+            self.logger.error(error_msg)
+            raise RuntimeError(error_msg)
+    
+    def _upsert_video(self, conn: sqlite3.Connection, video_path: str, fingerprint: Optional[str],
+                      model_name: Optional[str], language: Optional[str]) -> int:
+        """Insert or refresh a video record and clear its segments, keeping its id on reindex.
+        
+        Returns:
+            The video id
+        """
+        video_name = Path(video_path).name
+        video_size = os.path.getsize(video_path) if os.path.exists(video_path) else 0
+        
+        video_id = conn.execute("""
+            INSERT INTO videos (path, name, size, fingerprint, model, language)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(path) DO UPDATE SET
+                name = excluded.name,
+                size = excluded.size,
+                fingerprint = excluded.fingerprint,
+                model = excluded.model,
+                language = excluded.language,
+                indexed_at = CURRENT_TIMESTAMP
+            RETURNING id
+        """, (video_path, video_name, video_size, fingerprint, model_name, language)).fetchone()[0]
+        
+        # Replace any previous segments (triggers will handle FTS table)
+        conn.execute("DELETE FROM segments WHERE video_id = ?", (video_id,))
+        return video_id
+    
+    def _append_segments(self, video_id: int, batch: List[Tuple[int, float, float, str]]):
+        """Insert a batch of (video_id, start, end, text) rows in one short transaction."""
+        with self._write_lock, self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            
+            # Ids are assigned in increasing order, so the new rows are the ones
+            # above the current maximum
+            last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM segments").fetchone()[0]
+            conn.executemany(
+                "INSERT INTO segments (video_id, start_time, end_time, text) VALUES (?, ?, ?, ?)",
+                batch
+            )
+            conn.execute("""
+                INSERT INTO segments_fts(rowid, text, video_id, start_time, end_time)
+                SELECT id, text, video_id, start_time, end_time FROM segments
+                WHERE video_id = ? AND id > ?
+            """, (video_id, last_id))
+            
+            conn.commit()
+            self._invalidate_search_cache()
+    
+    def _invalidate_search_cache(self):
+        """Forget cached search results after the index has changed."""
+        self._generation += 1
+        self._search_cached.cache_clear()
+    
     def search(self, video_path: str, query: str, limit: int = 50) -> List[Dict[str, Any]]:
         """
         Search for text in video transcription.
@@ -139,10 +389,15 @@ class TranscriptionIndexer:
             limit: Maximum number of results
             
         Returns:
-            List of matching segments with metadata
+            List of matching segments with metadata; repeated searches share
+            the same list, which must not be modified
         """
+        return self._search_cached(self._generation, video_path, query.strip(), limit)
+    
+    def _search(self, generation: int, video_path: str, query: str, limit: int) -> List[Dict[str, Any]]:
+        """Run a search against the database; generation only keys the cache."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 # Get video ID
                 cursor = conn.execute("SELECT id FROM videos WHERE path = ?", (video_path,))
                 row = cursor.fetchone()
@@ -152,30 +407,48 @@ class TranscriptionIndexer:
                 
                 video_id = row[0]
                 
-                # Prepare FTS5 query (escape special characters)
-                fts_query = self.prepare_fts_query(query)
+                query = query.strip()
                 
-                # Search using FTS5
-                cursor = conn.execute("""
-                    SELECT s.start_time, s.end_time, s.text, 
-                           snippet(segments_fts, 0, '<mark>', '</mark>', '...', 32) as highlighted_text,
-                           rank
-                    FROM segments s
-                    JOIN segments_fts ON segments_fts.rowid = s.id
-                    WHERE s.video_id = ? AND segments_fts MATCH ?
-                    ORDER BY rank
-                    LIMIT ?
-                """, (video_id, fts_query, limit))
-                
-                results = []
-                for row in cursor.fetchall():
-                    results.append({
-                        'start': float(row[0]),
-                        'end': float(row[1]),
-                        'text': row[2],
-                        'highlighted_text': row[3],
-                        'rank': row[4] if row[4] is not None else 0
-                    })
+                # A video's segments are inserted together, so their ids form a
+                # narrow range that bounds the FTS scan to this video
+                first_id, last_id = conn.execute(
+                    "SELECT MIN(id), MAX(id) FROM segments WHERE video_id = ?", (video_id,)
+                ).fetchone()
+                if first_id is None:
+                    return []
+                
+                if len(query) < MIN_TRIGRAM_QUERY_LENGTH:
+                    # Too short for the trigram index; scan this video's segments
+                    escaped_query = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+                    cursor = conn.execute("""
+                        SELECT start_time, end_time, text, text, 0
+                        FROM segments
+                        WHERE video_id = ? AND text LIKE ? ESCAPE '\\'
+                        ORDER BY start_time
+                        LIMIT ?
+                    """, (video_id, f"%{escaped_query}%", limit))
+                else:
+                    # Prepare FTS5 query (escape special characters)
+                    fts_query = self.prepare_fts_query(query)
+                    
+                    # Search using FTS5 within the video's rowid range; every returned
+                    # column comes from the FTS row, so no join back to segments
+                    cursor = conn.execute("""
+                        SELECT start_time, end_time, text,
+                               snippet(segments_fts, 0, '<mark>', '</mark>', '...', 32),
+                               bm25(segments_fts)
+                        FROM segments_fts
+                        WHERE segments_fts MATCH ? AND rowid BETWEEN ? AND ? AND video_id = ?
+                        ORDER BY bm25(segments_fts)
+                        LIMIT ?
+                    """, (fts_query, first_id, last_id, video_id, limit))
+                
+                # REAL columns already come back as floats
+                results = [
+                    {'start': start, 'end': end, 'text': text,
+                     'highlighted_text': highlighted_text, 'rank': rank if rank is not None else 0}
+                    for start, end, text, highlighted_text, rank in cursor
+                ]
                 
                 self.logger.info(f"Search completed: '{query}' -> {len(results)} results")
                 return results
@@ -187,25 +460,21 @@ class TranscriptionIndexer:
     
     def prepare_fts_query(self, query: str) -> str:
         """Prepare query for FTS5 search."""
-        # Basic query preparation - escape quotes and handle phrases
+        # The trigram tokenizer matches substrings, so every query is
+        # searched as a quoted phrase without wildcards
         query = query.strip()
         
         if not query:
             return '""'
         
-        # If query contains spaces, treat as phrase search
-        if ' ' in query:
-            # Escape quotes and wrap in quotes for phrase search
-            escaped_query = query.replace('"', '""')
-            return f'"{escaped_query}"'
-        else:
-            # Single word search with wildcard
-            return f"{query}*"
+        # Escape quotes and wrap in quotes for phrase search
+        escaped_query = query.replace('"', '""')
+        return f'"{escaped_query}"'
     
     def get_all_segments(self, video_path: str) -> List[Dict[str, Any]]:
         """Get all segments for a video."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 cursor = conn.execute("""
                     SELECT s.start_time, s.end_time, s.text
                     FROM segments s
@@ -214,57 +483,155 @@ class TranscriptionIndexer:
                     ORDER BY s.start_time
                 """, (video_path,))
                 
-                segments = []
-                for row in cursor.fetchall():
-                    segments.append({
-                        'start': float(row[0]),
-                        'end': float(row[1]),
-                        'text': row[2]
-                    })
-                
-                return segments
+                # REAL columns already come back as floats
+                return [{'start': start, 'end': end, 'text': text} for start, end, text in cursor]
                 
         except Exception as e:
             self.logger.error(f"Failed to get segments: {str(e)}")
             return []
     
+    def get_segment_table(self, video_path: str) -> SegmentTable:
+        """Get all segments for a video in compact column form."""
+        try:
+            with self._connection() as conn:
+                cursor = conn.execute("""
+                    SELECT s.start_time, s.end_time, s.text
+                    FROM segments s
+                    JOIN videos v ON v.id = s.video_id
+                    WHERE v.path = ?
+                    ORDER BY s.start_time
+                """, (video_path,))
+                return SegmentTable.from_rows(cursor.fetchall())
+                
+        except Exception as e:
+            self.logger.error(f"Failed to get segments: {str(e)}")
+            return SegmentTable.from_rows([])
+    
     def is_video_indexed(self, video_path: str) -> bool:
         """Check if a video is already indexed."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 cursor = conn.execute("SELECT id FROM videos WHERE path = ?", (video_path,))
                 return cursor.fetchone() is not None
         except Exception as e:
             self.logger.error(f"Failed to check video index: {str(e)}")
             return False
     
+    def find_video_by_fingerprint(self, fingerprint: str, model_name: str, language: Optional[str] = None,
+                                  exclude_path: Optional[str] = None) -> Optional[str]:
+        """
+        Find a video with the given content fingerprint transcribed with the same settings.
+        
+        Args:
+            fingerprint: Content fingerprint from file_fingerprint
+            model_name: Whisper model the transcription must come from
+            language: Transcription language, or None for auto-detection
+            exclude_path: Path that must not be returned
+        
+        Returns:
+            Path of the indexed video, or None if there is none
+        """
+        try:
+            with self._connection() as conn:
+                cursor = conn.execute("""
+                    SELECT path FROM videos
+                    WHERE fingerprint = ? AND model = ? AND language IS ? AND path IS NOT ?
+                    ORDER BY indexed_at DESC LIMIT 1
+                """, (fingerprint, model_name, language, exclude_path))
+                row = cursor.fetchone()
+                return row[0] if row else None
+        except Exception as e:
+            self.logger.error(f"Failed to look up video fingerprint: {str(e)}")
+            return None
+    
+    def get_indexed_paths(self, video_paths: Iterable[str]) -> set:
+        """
+        Find which of the given videos are indexed, using one query per batch of paths.
+        
+        Returns:
+            Set of the given paths that are indexed
+        """
+        video_paths = list(video_paths)
+        indexed = set()
+        try:
+            with self._connection() as conn:
+                for i in range(0, len(video_paths), MAX_QUERY_PARAMS):
+                    batch = video_paths[i:i + MAX_QUERY_PARAMS]
+                    placeholders = ",".join("?" * len(batch))
+                    cursor = conn.execute(f"SELECT path FROM videos WHERE path IN ({placeholders})", batch)
+                    indexed.update(row[0] for row in cursor)
+        except Exception as e:
+            self.logger.error(f"Failed to check video index: {str(e)}")
+        return indexed
+    
+    def list_indexed_videos(self) -> List[str]:
+        """Get paths of all indexed videos."""
+        try:
+            with self._connection() as conn:
+                return [row[0] for row in conn.execute("SELECT path FROM videos")]
+        except Exception as e:
+            self.logger.error(f"Failed to list indexed videos: {str(e)}")
+            return []
+    
+    def get_segment_count(self, video_path: str) -> Optional[int]:
+        """Count the indexed segments of a video without loading them.
+        
+        Returns:
+            Number of segments, or None if the video is not indexed
+        """
+        try:
+            with self._connection() as conn:
+                cursor = conn.execute("""
+                    SELECT COUNT(s.id)
+                    FROM videos v
+                    LEFT JOIN segments s ON s.video_id = v.id
+                    WHERE v.path = ?
+                    GROUP BY v.id
+                """, (video_path,))
+                row = cursor.fetchone()
+                return row[0] if row else None
+        except Exception as e:
+            self.logger.error(f"Failed to count segments: {str(e)}")
+            return None
+    
     def remove_video_index(self, video_path: str):
         """Remove all indexed data for a video."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                # Get video ID
-                cursor = conn.execute("SELECT id FROM videos WHERE path = ?", (video_path,))
-                row = cursor.fetchone()
-                
-                if row:
-                    video_id = row[0]
-                    
-                    # Delete segments (triggers will handle FTS table)
-                    conn.execute("DELETE FROM segments WHERE video_id = ?", (video_id,))
-                    
-                    # Delete video record
-                    conn.execute("DELETE FROM videos WHERE id = ?", (video_id,))
-                    
+            with self._write_lock, self._connection() as conn:
+                if self._delete_video(conn, video_path):
                     conn.commit()
+                    self._invalidate_search_cache()
                     self.logger.info(f"Removed index for video: {video_path}")
                     
         except Exception as e:
             self.logger.error(f"Failed to remove video index: {str(e)}")
     
+    def _delete_video(self, conn: sqlite3.Connection, video_path: str) -> bool:
+        """Delete a video and its segments using an open connection.
+        
+        Returns:
+            True if the video was indexed and has been removed
+        """
+        # Get video ID
+        cursor = conn.execute("SELECT id FROM videos WHERE path = ?", (video_path,))
+        row = cursor.fetchone()
+        
+        if not row:
+            return False
+        
+        video_id = row[0]
+        
+        # Delete segments (triggers will handle FTS table)
+        conn.execute("DELETE FROM segments WHERE video_id = ?", (video_id,))
+        
+        # Delete video record
+        conn.execute("DELETE FROM videos WHERE id = ?", (video_id,))
+        return True
+    
     def get_database_stats(self) -> Dict[str, Any]:
         """Get database statistics."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 # Count videos
                 cursor = conn.execute("SELECT COUNT(*) FROM videos")
                 video_count = cursor.fetchone()[0]
@@ -288,18 +655,41 @@ class TranscriptionIndexer:
             return {}
     
     def optimize_database(self):
-        """Optimize the database (rebuild FTS index, vacuum)."""
+        """Optimize the database (rebuild FTS index, vacuum).
+        
+        Rewrites the whole file, so it should not run on the GUI thread; see
+        optimize_database_async.
+        """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                # Rebuild FTS5 index
-                conn.execute("INSERT INTO segments_fts(segments_fts) VALUES('rebuild')")
+            with self._write_lock:
+                conn = self._connection()
+                with conn:
+                    # Rebuild FTS5 index
+                    conn.execute("INSERT INTO segments_fts(segments_fts) VALUES('rebuild')")
                 
-                # Vacuum database
+                # VACUUM cannot run inside a transaction, so it follows the commit
                 conn.execute("VACUUM")
                 
-                conn.commit()
-                
             self.logger.info("Database optimized")
             
         except Exception as e:
             self.logger.error(f"Database optimization failed: {str(e)}")
+    
+    def optimize_database_async(self) -> threading.Thread:
+        """Run optimize_database in a background thread and return the thread."""
+        thread = threading.Thread(target=self.optimize_database, name="db-optimize", daemon=True)
+        thread.start()
+        return thread
+    
+    def close(self):
+        """Let SQLite refresh stale query planner statistics, then close this thread's connection."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            return
+        try:
+            # Only runs ANALYZE on tables whose statistics are out of date
+            conn.execute("PRAGMA optimize")
+        except sqlite3.Error as e:
+            self.logger.warning(f"PRAGMA optimize failed: {str(e)}")
+        conn.close()
+        self._local.conn = None
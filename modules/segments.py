@@ -0,0 +1,100 @@
+"""
+Compact in-memory storage for transcription segments.
+"""
+
+import functools
+from dataclasses import dataclass
+from typing import List, Dict, Any, Iterable, Iterator, Tuple, Union
+
+import numpy as np
+
+
+@dataclass
+class SegmentTable:
+    """Transcription segments stored column-wise.
+
+    Timestamps live in float64 arrays and texts in a plain list, which takes a
+    fraction of the memory of one dict per segment. Iterating the table still
+    yields segment dicts for code that expects the list form.
+    """
+    starts: np.ndarray
+    ends: np.ndarray
+    texts: List[str]
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[float, float, str]]) -> "SegmentTable":
+        """Build a table from (start, end, text) tuples."""
+        rows = list(rows)
+        if not rows:
+            return cls(np.empty(0), np.empty(0), [])
+
+        starts, ends, texts = zip(*rows)
+        return cls(np.array(starts, dtype=np.float64), np.array(ends, dtype=np.float64), list(texts))
+
+    @classmethod
+    def from_segments(cls, segments: List[Dict[str, Any]]) -> "SegmentTable":
+        """Build a table from a list of segment dicts."""
+        return cls.from_rows((seg['start'], seg['end'], seg['text']) for seg in segments)
+
+    def rows(self) -> Iterator[Tuple[float, float, str]]:
+        """Iterate over (start, end, text) tuples."""
+        return zip(self.starts.tolist(), self.ends.tolist(), self.texts)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for start, end, text in self.rows():
+            yield {'start': start, 'end': end, 'text': text}
+    
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        """Return one segment as a dict, like indexing the list form."""
+        return {'start': float(self.starts[index]), 'end': float(self.ends[index]), 'text': self.texts[index]}
+
+    @functools.cached_property
+    def _search_text(self) -> Tuple[str, np.ndarray]:
+        """All texts lowercased and joined by newlines, with each text's start offset."""
+        lowered = [text.lower() for text in self.texts]
+        lengths = np.fromiter((len(text) + 1 for text in lowered), dtype=np.int64, count=len(lowered))
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        return "\n".join(lowered), offsets
+
+    def find(self, query: str, limit: int = 50) -> List[int]:
+        """
+        Find segments containing a substring, case-insensitively.
+
+        The joined text is built on the first call, so each search is a scan
+        of one string followed by a binary search of the match offsets.
+
+        Args:
+            query: Substring to look for
+            limit: Maximum number of results
+
+        Returns:
+            Indices of matching segments in time order
+        """
+        query = query.lower()
+        if not query or not self.texts:
+            return []
+
+        text, offsets = self._search_text
+        matches = []
+        last_index = -1
+        position = text.find(query)
+        while position != -1 and len(matches) < limit:
+            index = int(np.searchsorted(offsets, position, side='right')) - 1
+            if index != last_index:
+                matches.append(index)
+                last_index = index
+            # Continue with the next segment
+            if index + 1 == len(offsets):
+                break
+            position = text.find(query, int(offsets[index + 1]))
+        return matches
+
+
+def iter_rows(segments: Union[SegmentTable, List[Dict[str, Any]]]) -> Iterator[Tuple[float, float, str]]:
+    """Iterate over (start, end, text) tuples of a table or a list of segment dicts."""
+    if isinstance(segments, SegmentTable):
+        return segments.rows()
+    return ((seg['start'], seg['end'], seg['text']) for seg in segments)
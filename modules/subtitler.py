@@ -1,34 +1,58 @@
 """
-Subtitle generation module using pysubs2.
+Subtitle generation module.
 """
 
 import os
+import re
+import unicodedata
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple, Union
 
-try:
-    import pysubs2
-    PYSUBS2_AVAILABLE = True
-except ImportError:
-    PYSUBS2_AVAILABLE = False
+import numpy as np
 
+from modules.segments import SegmentTable, iter_rows
 from utils.logger import get_logger
 
+# Characters dropped from subtitle text (control characters, soft hyphen,
+# zero-width space, byte order mark) or turned into plain spaces (line breaks,
+# tabs, no-break space) before whitespace is collapsed
+_CLEAN_TABLE = dict.fromkeys([*range(0x20), 0x7F, 0x00AD, 0x200B, 0xFEFF])
+_CLEAN_TABLE.update(dict.fromkeys([0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x00A0], ' '))
+
+# Runs of whitespace collapsed to one space in subtitle text
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Space before punctuation, a common transcription artifact
+_SPACE_BEFORE_PUNCT_RE = re.compile(r' ([.,?!])')
+
+# Zero-padded numbers for timestamp fields, looked up instead of formatted
+_TWO_DIGITS = tuple(f"{i:02d}" for i in range(100))
+_THREE_DIGITS = tuple(f"{i:03d}" for i in range(1000))
+
+def format_timestamps(seconds: np.ndarray, separator: str = ",") -> List[str]:
+    """Format an array of seconds as HH:MM:SS,mmm (SRT) or HH:MM:SS.mmm (VTT), with the arithmetic done in bulk."""
+    ms = np.maximum(np.rint(np.asarray(seconds, dtype=np.float64) * 1000), 0).astype(np.int64)
+    hours, ms = np.divmod(ms, 3600000)
+    minutes, ms = np.divmod(ms, 60000)
+    secs, ms = np.divmod(ms, 1000)
+    two, three = _TWO_DIGITS, _THREE_DIGITS
+    return [
+        f"{two[h] if h < 100 else h}:{two[m]}:{two[s]}{separator}{three[msec]}"
+        for h, m, s, msec in zip(hours.tolist(), minutes.tolist(), secs.tolist(), ms.tolist())
+    ]
+
 class SubtitleGenerator:
     """Generate subtitle files from transcription segments."""
     
     def __init__(self):
         self.logger = get_logger()
-        
-        if not PYSUBS2_AVAILABLE:
-            raise ImportError("pysubs2 not available. Please install: pip install pysubs2")
     
-    def generate(self, segments: List[Dict[str, Any]], video_path: str, format: str = "srt") -> str:
+    def generate(self, segments: Union[SegmentTable, List[Dict[str, Any]]], video_path: str, format: str = "srt") -> str:
         """
         Generate subtitle file from transcription segments.
         
         Args:
-            segments: List of transcription segments with start, end, text
+            segments: SegmentTable or list of transcription segments with start, end, text
             video_path: Original video file path (used for output naming)
             format: Subtitle format ('srt' or 'vtt')
             
@@ -38,86 +62,82 @@ class SubtitleGenerator:
         if not segments:
             raise ValueError("No segments provided for subtitle generation")
         
-        # Determine output path
-        video_dir = Path(video_path).parent
-        video_name = Path(video_path).stem
-        subtitle_path = video_dir / f"{video_name}.{format.lower()}"
-        
         try:
-            self.logger.info(f"Generating {format.upper()} subtitles: {subtitle_path}")
-            
-            # Create subtitle file
-            subs = pysubs2.SSAFile()
-            
-            for segment in segments:
-                # Convert seconds to milliseconds for pysubs2
-                start_ms = int(segment['start'] * 1000)
-                end_ms = int(segment['end'] * 1000)
-                text = segment['text']
-                
-                # Clean up text
-                text = self.clean_text(text)
-                
-                if text:  # Only add non-empty text
-                    # Create subtitle line
-                    line = pysubs2.SSAEvent(
-                        start=start_ms,
-                        end=end_ms,
-                        text=text
-                    )
-                    subs.append(line)
-            
-            # Save subtitle file
-            if format.lower() == "srt":
-                subs.save(str(subtitle_path), format_="srt")
-            elif format.lower() == "vtt":
-                subs.save(str(subtitle_path), format_="webvtt")
-            else:
-                raise ValueError(f"Unsupported subtitle format: {format}")
-            
-            self.logger.info(f"Subtitles generated: {subtitle_path} ({len(subs)} lines)")
-            return str(subtitle_path)
-            
+            return self._write(self._clean_rows(segments), video_path, format)
         except Exception as e:
             error_msg = f"Subtitle generation failed: {str(e)}"
             self.logger.error(error_msg)
             raise RuntimeError(error_msg)
     
-    def generate_both_formats(self, segments: List[Dict[str, Any]], video_path: str) -> Dict[str, str]:
+    def generate_both_formats(self, segments: Union[SegmentTable, List[Dict[str, Any]]], video_path: str) -> Dict[str, str]:
         """Generate both SRT and VTT subtitle files."""
-        results = {}
+        if not segments:
+            raise ValueError("No segments provided for subtitle generation")
         
         try:
-            results['srt'] = self.generate(segments, video_path, "srt")
-            results['vtt'] = self.generate(segments, video_path, "vtt")
-            return results
+            # Clean the text once; only the timestamp format differs between the files
+            rows = self._clean_rows(segments)
+            return {format: self._write(rows, video_path, format) for format in ("srt", "vtt")}
         except Exception as e:
             self.logger.error(f"Failed to generate subtitle formats: {str(e)}")
-            raise
+            raise RuntimeError(f"Subtitle generation failed: {str(e)}")
+    
+    def _clean_rows(self, segments: Union[SegmentTable, List[Dict[str, Any]]]) -> List[Tuple[float, float, str]]:
+        """Clean segment texts, dropping segments left without text."""
+        rows = []
+        for start, end, text in iter_rows(segments):
+            text = self.clean_text(text)
+            if text:  # Only add non-empty text
+                rows.append((start, end, text))
+        return rows
+    
+    def _write(self, rows: List[Tuple[float, float, str]], video_path: str, format: str) -> str:
+        """Write cleaned rows as a subtitle file next to the video and return its path."""
+        if format.lower() == "srt":
+            header, separator = "", ","
+        elif format.lower() == "vtt":
+            header, separator = "WEBVTT\n\n", "."
+        else:
+            raise ValueError(f"Unsupported subtitle format: {format}")
+        
+        # Determine output path
+        video_dir = Path(video_path).parent
+        video_name = Path(video_path).stem
+        subtitle_path = video_dir / f"{video_name}.{format.lower()}"
+        
+        self.logger.info(f"Generating {format.upper()} subtitles: {subtitle_path}")
+        
+        # Convert all timestamps at once, then build the whole file in memory
+        # and write it in one call
+        starts = format_timestamps(np.fromiter((row[0] for row in rows), dtype=np.float64, count=len(rows)), separator)
+        ends = format_timestamps(np.fromiter((row[1] for row in rows), dtype=np.float64, count=len(rows)), separator)
+        blocks = [
+            f"{number}\n{start} --> {end}\n{text}\n"
+            for number, (start, end, (_, _, text)) in enumerate(zip(starts, ends, rows), 1)
+        ]
+        
+        with open(subtitle_path, "w", encoding="utf-8") as f:
+            f.write(header + "\n".join(blocks))
+        
+        self.logger.info(f"Subtitles generated: {subtitle_path} ({len(blocks)} lines)")
+        return str(subtitle_path)
     
     def clean_text(self, text: str) -> str:
         """Clean and format subtitle text."""
         if not text:
             return ""
         
-        # Remove leading/trailing whitespace
-        text = text.strip()
+        # Compose combining characters and drop invisible ones
+        text = unicodedata.normalize('NFC', text).translate(_CLEAN_TABLE)
         
-        # Remove multiple spaces
-        import re
-        text = re.sub(r'\s+', ' ', text)
+        # Remove leading/trailing whitespace and multiple spaces
+        text = _WHITESPACE_RE.sub(' ', text.strip())
         
         # Handle common transcription artifacts
-        text = text.replace(' .', '.')
-        text = text.replace(' ,', ',')
-        text = text.replace(' ?', '?')
-        text = text.replace(' !', '!')
+        text = _SPACE_BEFORE_PUNCT_RE.sub(r'\1', text)
         
         # Capitalize first letter
-        if text and text[0].islower():
-            text = text[0].upper() + text[1:]
-        
-        return text
+        return text[:1].upper() + text[1:]
     
     def merge_short_segments(self, segments: List[Dict[str, Any]], min_duration: float = 1.0, max_chars: int = 100) -> List[Dict[str, Any]]:
         """
@@ -136,6 +156,9 @@ class SubtitleGenerator:
         
         merged = []
         current_segment = None
+        # Texts of the current segment, joined once when it is flushed
+        text_parts = []
+        current_length = 0
         
         for segment in segments:
             duration = segment['end'] - segment['start']
@@ -143,20 +166,27 @@ class SubtitleGenerator:
             
             if current_segment is None:
                 current_segment = segment.copy()
+                text_parts = [text]
+                current_length = len(text)
             elif (duration < min_duration and 
-                  len(current_segment['text']) + len(text) <= max_chars and
+                  current_length + len(text) <= max_chars and
                   segment['start'] - current_segment['end'] <= 1.0):  # Gap <= 1 second
                 
                 # Merge with current segment
                 current_segment['end'] = segment['end']
-                current_segment['text'] += " " + text
+                text_parts.append(text)
+                current_length += 1 + len(text)
             else:
                 # Start new segment
+                current_segment['text'] = " ".join(text_parts)
                 merged.append(current_segment)
                 current_segment = segment.copy()
+                text_parts = [text]
+                current_length = len(text)
         
         # Add last segment
         if current_segment:
+            current_segment['text'] = " ".join(text_parts)
             merged.append(current_segment)
         
         self.logger.info(f"Merged {len(segments)} segments into {len(merged)} subtitle lines")
@@ -184,19 +214,23 @@ class SubtitleGenerator:
                 split_segments.append(segment)
                 continue
             
-            # Split long text
+            # Split long text, tracking the line length instead of joining
+            # the line again for every word
             words = text.split()
             lines = []
             current_line = []
+            current_length = 0
             
             for word in words:
-                test_line = ' '.join(current_line + [word])
-                if len(test_line) <= max_chars:
+                test_length = current_length + 1 + len(word) if current_line else len(word)
+                if test_length <= max_chars:
                     current_line.append(word)
+                    current_length = test_length
                 else:
                     if current_line:
                         lines.append(' '.join(current_line))
                         current_line = [word]
+                        current_length = len(word)
                     else:
                         # Single word too long, force it
                         lines.append(word)
@@ -207,13 +241,13 @@ class SubtitleGenerator:
             # Create segments for each line
             if lines:
                 line_duration = duration / len(lines)
+                segment_start = segment['start']
                 for i, line in enumerate(lines):
-                    start_time = segment['start'] + (i * line_duration)
-                    end_time = start_time + line_duration
+                    start_time = segment_start + (i * line_duration)
                     
                     split_segments.append({
                         'start': start_time,
-                        'end': end_time,
+                        'end': start_time + line_duration,
                         'text': line
                     })
             else:
@@ -223,6 +257,12 @@ class SubtitleGenerator:
     
     def optimize_subtitles(self, segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Optimize subtitle segments for better readability."""
+        # Nothing would change when every line is already within the merge and
+        # split limits (the defaults of the two methods below)
+        if all(1.0 <= seg['end'] - seg['start'] <= 6.0 and len(seg['text']) <= 80 for seg in segments):
+            self.logger.info(f"Subtitle lines already within limits: {len(segments)} lines kept")
+            return list(segments)
+        
         # First merge short segments
         optimized = self.merge_short_segments(segments)
         
@@ -3,10 +3,15 @@ Speech recognition module using Whisper.
 """
 
 import os
+import subprocess
+import sys
 import time
+import contextlib
 import ctypes
+import functools
+import threading
 import numpy as np
-from typing import List, Dict, Any, Callable, Optional
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple, Union
 
 try:
     import whisper
@@ -14,20 +19,151 @@ try:
 except ImportError:
     WHISPER_AVAILABLE = False
 
+try:
+    import ctranslate2
+    from faster_whisper import WhisperModel
+    FASTER_WHISPER_AVAILABLE = True
+except ImportError:
+    FASTER_WHISPER_AVAILABLE = False
+
+try:
+    from faster_whisper import BatchedInferencePipeline
+    BATCHED_PIPELINE_AVAILABLE = True
+except ImportError:
+    BATCHED_PIPELINE_AVAILABLE = False
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows
+    fcntl = None
+
+from modules.segments import SegmentTable
+from modules.wavfile import read_wav_header, map_samples
 from utils.logger import get_logger
 from utils.ffmpeg_downloader import FFmpegManager
 
+# Sample rate Whisper expects
+SAMPLE_RATE = 16000
+
+# Size of the FFmpeg decode pipe and of each read from it
+FFMPEG_PIPE_BUFFER_SIZE = 1 << 20
+
+# Number of 30-second windows decoded together by the batched faster-whisper pipeline
+BATCH_SIZE = 8
+
+# Set to 0 to use openai-whisper even when faster-whisper is installed
+USE_FASTER_WHISPER = os.getenv("USE_FASTER_WHISPER", "1") != "0"
+
+# Factor that maps 16-bit PCM samples onto [-1.0, 1.0)
+INT16_SCALE = np.float32(1.0 / 32768.0)
+
+# Whisper model names offered for transcription
+AVAILABLE_MODELS = (
+    "tiny",
+    "tiny.en",
+    "base",
+    "base.en",
+    "small",
+    "small.en",
+    "medium",
+    "medium.en",
+    "large-v1",
+    "large-v2",
+    "large"
+)
+
+# Rough processing time per second of audio for each model size
+PROCESSING_TIME_RATIOS = {
+    "tiny": 0.1,
+    "tiny.en": 0.1,
+    "base": 0.2,
+    "base.en": 0.2,
+    "small": 0.4,
+    "small.en": 0.4,
+    "medium": 0.8,
+    "medium.en": 0.8,
+    "large-v1": 1.5,
+    "large-v2": 1.5,
+    "large": 1.5
+}
+
+# Number of loaded models shared between transcriber instances; each can take gigabytes
+MODEL_CACHE_SIZE = 2
+
+# Short path names only exist on Windows; elsewhere get_long_path returns its argument
+if sys.platform == "win32":
+    from ctypes import wintypes
+    _get_long_path_name = ctypes.windll.kernel32.GetLongPathNameW
+    _get_long_path_name.argtypes = [wintypes.LPCWSTR, wintypes.LPWSTR, wintypes.DWORD]
+    _get_long_path_name.restype = wintypes.DWORD
+else:
+    _get_long_path_name = None
+
+# Letters Whisper confuses in Ukrainian output, fixed in one pass per segment
+_UK_TABLE = str.maketrans({"и": "і"})
+
+# Held while a model loads so concurrent transcribers don't load it twice
+_model_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=MODEL_CACHE_SIZE)
+def _load_model(backend: str, model_name: str):
+    """Load a Whisper model, or return the already loaded one.
+    
+    Returns:
+        Tuple of (model, batched pipeline or None)
+    """
+    get_logger().info(f"Loading Whisper model: {model_name} ({backend})")
+    if backend == "faster-whisper":
+        if ctranslate2.get_cuda_device_count() > 0:
+            device, compute_type = "cuda", "int8_float16"
+        else:
+            device, compute_type = "cpu", "int8"
+        # CTranslate2 uses only 4 threads by default; one model spread over
+        # every core beats a model copy per process
+        model = WhisperModel(model_name, device=device, compute_type=compute_type,
+                             cpu_threads=os.cpu_count() or 0)
+        # Decode several audio windows per forward pass
+        pipeline = BatchedInferencePipeline(model=model) if BATCHED_PIPELINE_AVAILABLE else None
+        return model, pipeline
+    
+    import torch
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    return whisper.load_model(model_name, device=device), None
+
+def release_models():
+    """Drop every model from the shared cache; each is freed once no transcriber holds it."""
+    with _model_lock:
+        _load_model.cache_clear()
+
+
+def pcm_to_float32(samples: np.ndarray) -> np.ndarray:
+    """Convert 16-bit PCM samples to the float32 [-1.0, 1.0] range Whisper expects."""
+    if samples.dtype == np.int16:
+        # One pass that converts and scales, without a float32 temporary
+        return np.multiply(samples, INT16_SCALE, dtype=np.float32)
+    return samples.astype(np.float32, copy=False)
+
+def downmix_to_mono(samples: np.ndarray, n_channels: int) -> np.ndarray:
+    """Average interleaved float32 channels into a single channel."""
+    mono = np.empty(len(samples) // n_channels, dtype=np.float32)
+    if n_channels == 2:
+        # Adding the two strided views beats the general mean reduction
+        np.add(samples[0::2], samples[1::2], out=mono)
+        mono *= 0.5
+    else:
+        np.mean(samples.reshape(-1, n_channels), axis=1, dtype=np.float32, out=mono)
+    return mono
 
 def get_long_path(short_path):
     """Convert Windows 8.3 short path to long path"""
-    if not os.path.exists(short_path):
+    if _get_long_path_name is None or not os.path.exists(short_path):
         return short_path
     
     try:
         buffer_size = 260  # MAX_PATH
         buffer = ctypes.create_unicode_buffer(buffer_size)
-        get_long_path_name = ctypes.windll.kernel32.GetLongPathNameW
-        result = get_long_path_name(short_path, buffer, buffer_size)
+        result = _get_long_path_name(short_path, buffer, buffer_size)
         if result == 0:
             return short_path  # Return original if conversion fails
         return buffer.value
@@ -35,9 +171,17 @@ def get_long_path(short_path):
         return short_path  # Return original if any error occurs
 
 class WhisperTranscriber:
-    """Class for transcribing audio files using OpenAI's Whisper."""
+    """Class for transcribing audio files using OpenAI's Whisper.
+    
+    Uses the faster-whisper (CTranslate2) backend with int8 quantization when
+    it is installed and falls back to the reference openai-whisper package.
+    """
     
-    def __init__(self, model_name="base", ffmpeg_manager=None, language=None):
+    # FFmpeg setup is process-wide, so only the first instance performs it
+    _ffmpeg_configured = False
+    _ffmpeg_lock = threading.Lock()
+    
+    def __init__(self, model_name="base", ffmpeg_manager=None, language=None, batch_size=None):
         """Initialize the transcriber.
         
         Args:
@@ -45,146 +189,184 @@ class WhisperTranscriber:
             ffmpeg_manager: FFmpegManager instance for handling FFmpeg paths.
             language: Language code to use for transcription (e.g., "uk" for Ukrainian).
                      If None, language will be auto-detected.
+            batch_size: Audio windows decoded together by the batched pipeline
+                     (default: BATCH_SIZE).
         """
         self.model_name = model_name
         self.model = None
+        self.pipeline = None
         self.language = language
+        self.batch_size = batch_size or BATCH_SIZE
+        # Decoded audio file of the open chunking session, ((path, mtime, size), samples)
+        self._audio_cache = None
         self.logger = get_logger()
         self.ffmpeg_manager = ffmpeg_manager or FFmpegManager()
+        if FASTER_WHISPER_AVAILABLE and (USE_FASTER_WHISPER or not WHISPER_AVAILABLE):
+            self.backend = "faster-whisper"
+        else:
+            self.backend = "openai-whisper"
 
-        if not WHISPER_AVAILABLE:
+        if not FASTER_WHISPER_AVAILABLE and not WHISPER_AVAILABLE:
             raise ImportError("Whisper not available. Please install: pip install openai-whisper")
 
-        # Ensure FFmpeg is available and configure Whisper to use it
-        try:
-            if self.ffmpeg_manager.ensure_ffmpeg():
-                ffmpeg_path = self.ffmpeg_manager.get_ffmpeg_path()
-                # Set environment variable so Whisper uses the bundled FFmpeg
-                os.environ["FFMPEG_BINARY"] = ffmpeg_path
-                self.logger.info("Using bundled FFmpeg")
-                try:
-                    # whisper.audio caches the path at import time, so update it explicitly
-                    whisper.audio.FFMPEG = ffmpeg_path
-                except Exception as e:
-                    self.logger.warning(f"Failed to update Whisper FFmpeg path: {e}")
-            else:
-                self.logger.warning("FFmpeg could not be ensured; Whisper may fail if FFmpeg is missing")
-        except Exception as e:
-            self.logger.warning(f"Failed to configure FFmpeg for Whisper: {str(e)}")
+        # Ensure FFmpeg is available and configure Whisper to use it, once per process
+        self._configure_ffmpeg(self.ffmpeg_manager)
+    
+    @classmethod
+    def _configure_ffmpeg(cls, ffmpeg_manager: FFmpegManager):
+        """Point Whisper at the FFmpeg executable; later calls return immediately."""
+        with cls._ffmpeg_lock:
+            if cls._ffmpeg_configured:
+                return
+            cls._ffmpeg_configured = True
+            
+            logger = get_logger()
+            try:
+                if ffmpeg_manager.ensure_ffmpeg():
+                    ffmpeg_path = ffmpeg_manager.get_ffmpeg_path()
+                    # Set environment variable so Whisper uses the bundled FFmpeg
+                    os.environ["FFMPEG_BINARY"] = ffmpeg_path
+                    logger.info("Using bundled FFmpeg")
+                    if WHISPER_AVAILABLE:
+                        try:
+                            # whisper.audio caches the path at import time, so update it explicitly
+                            whisper.audio.FFMPEG = ffmpeg_path
+                        except Exception as e:
+                            logger.warning(f"Failed to update Whisper FFmpeg path: {e}")
+                else:
+                    logger.warning("FFmpeg could not be ensured; Whisper may fail if FFmpeg is missing")
+            except Exception as e:
+                logger.warning(f"Failed to configure FFmpeg for Whisper: {str(e)}")
     
     def load_model(self):
         """Load the Whisper model."""
         if self.model is None:
-            self.logger.info(f"Loading Whisper model: {self.model_name}")
             try:
-                self.model = whisper.load_model(self.model_name)
+                # Instances with other language or batch settings share the model
+                with _model_lock:
+                    self.model, self.pipeline = _load_model(self.backend, self.model_name)
                 self.logger.info("Whisper model loaded successfully")
             except Exception as e:
                 self.logger.error(f"Failed to load Whisper model: {str(e)}")
                 raise
     
-    def transcribe(self, audio_path: str, progress_callback: Optional[Callable] = None) -> List[Dict[str, Any]]:
+    def _run_model(self, audio, verbose: Optional[bool] = False):
+        """Run the loaded model on a file path or 16 kHz float32 array.
+        
+        Returns:
+            Tuple of (iterator of segment dicts, audio duration in seconds)
+        """
+        options = {'word_timestamps': True}
+        if self.language:
+            options['language'] = self.language
+        
+        if self.backend == "faster-whisper":
+            # faster-whisper yields segments lazily while decoding
+            if self.pipeline is not None:
+                raw_segments, info = self.pipeline.transcribe(audio, batch_size=self.batch_size, **options)
+            else:
+                # Silero VAD drops silence and music before inference; the
+                # batched pipeline already applies it by default
+                raw_segments, info = self.model.transcribe(audio, vad_filter=True, **options)
+            segments = (
+                {'start': seg.start, 'end': seg.end, 'text': seg.text}
+                for seg in raw_segments
+            )
+            return segments, float(info.duration)
+        
+        on_gpu = self.model.device.type == "cuda"
+        if on_gpu and isinstance(audio, np.ndarray):
+            # whisper computes the log-Mel spectrogram wherever the samples
+            # are, so moving them first keeps that off the CPU too
+            import torch
+            audio = torch.from_numpy(audio).to(self.model.device)
+        
+        # Half precision on the GPU; on the CPU whisper would warn and fall back to fp32
+        result = self.model.transcribe(audio, verbose=verbose, fp16=on_gpu, **options)
+        return iter(result.get('segments', [])), float(result.get('duration', 60.0))
+    
+    def transcribe(self, audio_path: Union[str, np.ndarray],
+                   progress_callback: Optional[Callable] = None) -> SegmentTable:
         """
-        Transcribe audio file to text with timestamps.
+        Transcribe audio to text with timestamps.
         
         Args:
-            audio_path: Path to audio file
+            audio_path: Path to a WAV file, or 16 kHz mono PCM samples
             progress_callback: Optional callback for progress updates
             
         Returns:
-            List of segments with start, end, and text
+            Segments in column form; iterating yields start/end/text dicts
+        """
+        return SegmentTable.from_rows(
+            (seg['start'], seg['end'], seg['text'])
+            for seg in self.iter_segments(audio_path, progress_callback)
+        )
+    
+    def iter_segments(self, audio_path: Union[str, np.ndarray],
+                      progress_callback: Optional[Callable] = None) -> Iterator[Dict[str, Any]]:
         """
-        if not os.path.exists(audio_path):
+        Transcribe audio and yield segments as they become available.
+        
+        Args:
+            audio_path: Path to a WAV file, or 16 kHz mono PCM samples already
+                in memory (see AudioExtractor.extract_to_array)
+            progress_callback: Optional callback for progress updates
+            
+        Yields:
+            Segments with start, end, and text
+        """
+        in_memory = isinstance(audio_path, np.ndarray)
+        if not in_memory and not os.path.exists(audio_path):
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
         
         # Load model if not already loaded
         self.load_model()
         
         try:
-            # Convert to long path to avoid issues with Windows 8.3 format
-            long_audio_path = get_long_path(audio_path)
-            self.logger.info(f"Starting transcription: {long_audio_path}")
-            start_time = time.time()
+            started_at = time.time()
+            segment_count = 0
             
-            # Verify file exists and is accessible
-            if not os.path.exists(long_audio_path):
-                raise FileNotFoundError(f"Audio file not found: {long_audio_path}")
-                
-            # Check file is readable and has content
-            try:
-                file_size = os.path.getsize(long_audio_path)
-                if file_size == 0:
-                    raise ValueError(f"Audio file is empty: {long_audio_path}")
+            if in_memory:
+                self.logger.info(f"Starting transcription of in-memory audio ({len(audio_path)} samples)")
+            else:
+                # Convert to long path to avoid issues with Windows 8.3 format
+                long_audio_path = get_long_path(audio_path)
+                self.logger.info(f"Starting transcription: {long_audio_path}")
+            
+                # Verify file exists and is accessible
+                if not os.path.exists(long_audio_path):
+                    raise FileNotFoundError(f"Audio file not found: {long_audio_path}")
                 
-                # Try to open the file to check if it's accessible
-                with open(long_audio_path, 'rb') as f:
-                    # Read a small chunk to ensure file is readable
-                    f.read(1024)
+                # Check file is readable and has content
+                try:
+                    file_size = os.path.getsize(long_audio_path)
+                    if file_size == 0:
+                        raise ValueError(f"Audio file is empty: {long_audio_path}")
                 
-                self.logger.info(f"Audio file verified: {long_audio_path} ({file_size} bytes)")
+                    # Try to open the file to check if it's accessible
+                    with open(long_audio_path, 'rb') as f:
+                        # Read a small chunk to ensure file is readable
+                        f.read(1024)
                 
-                # Small delay to ensure file is fully accessible
-                time.sleep(0.5)
-            except Exception as e:
-                self.logger.error(f"Audio file access error: {str(e)}")
-                raise
+                    self.logger.info(f"Audio file verified: {long_audio_path} ({file_size} bytes)")
+                except Exception as e:
+                    self.logger.error(f"Audio file access error: {str(e)}")
+                    raise
             
             # Progress callback for initial setup
             if progress_callback:
                 progress_callback(0, "Loading audio...")
             
-            # Использование абсолютного пути и настройка параметров whisper
-            # Добавим явную настройку для FFmpeg
+            # FFmpeg for Whisper was configured once in _configure_ffmpeg
             try:
-                # Устанавливаем вручную путь к FFmpeg для Whisper
-                ffmpeg_path = self.ffmpeg_manager.get_ffmpeg_path()
-                os.environ["FFMPEG_BINARY"] = ffmpeg_path
-                
                 # Загружаем аудио напрямую через встроенную библиотеку wave и numpy
-                self.logger.info(f"Loading audio directly: {long_audio_path}")
                 try:
-                    # Загружаем WAV файл напрямую
-                    import wave
-                    from whisper.audio import log_mel_spectrogram, pad_or_trim
-                    
-                    # Чтение аудио файла напрямую с помощью модуля wave
-                    self.logger.info("Reading WAV file...")
-                    with wave.open(long_audio_path, 'rb') as wav_file:
-                        sample_rate = wav_file.getframerate()
-                        n_channels = wav_file.getnchannels()
-                        sample_width = wav_file.getsampwidth()  # in bytes
-                        n_frames = wav_file.getnframes()
-                        
-                        # Чтение всех фреймов
-                        raw_data = wav_file.readframes(n_frames)
-                    
-                    # Конвертируем байты в числа используя numpy
-                    if sample_width == 1:  # 8-bit unsigned
-                        audio_data = np.frombuffer(raw_data, dtype=np.uint8)
-                        # Нормализация: от [0, 255] к [-1.0, 1.0]
-                        audio_data = (audio_data.astype(np.float32) - 128) / 128.0
-                    elif sample_width == 2:  # 16-bit signed
-                        audio_data = np.frombuffer(raw_data, dtype=np.int16)
-                        # Нормализация: от [-32768, 32767] к [-1.0, 1.0]
-                        audio_data = audio_data.astype(np.float32) / 32768.0
-                    elif sample_width == 4:  # 32-bit signed
-                        audio_data = np.frombuffer(raw_data, dtype=np.int32)
-                        # Нормализация: от [-2^31, 2^31-1] к [-1.0, 1.0]
-                        audio_data = audio_data.astype(np.float32) / 2147483648.0
-                    
-                    self.logger.info(f"Audio loaded, sample rate: {sample_rate}, channels: {n_channels}, length: {len(audio_data)}")
+                    if in_memory:
+                        audio_data = pcm_to_float32(audio_path)
+                    else:
+                        self.logger.info(f"Loading audio directly: {long_audio_path}")
+                        audio_data = self._load_audio(long_audio_path)
                     
-                    # Если стерео, разбиваем каналы и усредняем
-                    if n_channels > 1:
-                        # Раскладываем данные по каналам и усредняем
-                        audio_data = audio_data.reshape(-1, n_channels).mean(axis=1)
-                        
-                    # Whisper ожидает 16kHz моно float32
-                    # Если частота отличается от 16kHz, просто предупредим
-                    # Whisper позаботится об этом сам
-                    if sample_rate != 16000:
-                        self.logger.warning(f"Audio sample rate is {sample_rate}Hz, but Whisper expects 16000Hz")
-                        
                     self.logger.info(f"Audio data prepared, length: {len(audio_data)} samples")
                     
                     # Транскрибируем с настройками для timestamps, передавая данные напрямую
@@ -193,34 +375,25 @@ class WhisperTranscriber:
                     # Если язык указан явно, используем его
                     if self.language:
                         self.logger.info(f"Using specified language: {self.language}")
-                        result = self.model.transcribe(
-                            audio_data, 
-                            word_timestamps=True, 
-                            verbose=True,
-                            language=self.language  # Явно указываем язык
-                        )
-                    else:
-                        # Автоопределение языка
-                        result = self.model.transcribe(audio_data, word_timestamps=True, verbose=True)
                     
-                    # Обрабатываем результаты
-                    segments = []
-                    total_audio_duration = float(result.get('duration', 60.0))  # В секундах, по умолчанию 60 секунд
+                    raw_segments, total_audio_duration = self._run_model(audio_data, verbose=True)
                     
-                    for i, segment in enumerate(result.get('segments', [])):
+                    # Обрабатываем результаты
+                    for i, segment in enumerate(raw_segments):
                         text = segment["text"].strip()
                         start_time = segment["start"]
                         end_time = segment["end"]
                         
                         if self.language == "uk":
-                            # Заменяем часто путаемые буквы или слова
-                            text = text.replace("и", "і")
+                            # Заменяем часто путаемые буквы
+                            text = text.translate(_UK_TABLE)
                         
-                        segments.append({
+                        segment_count += 1
+                        yield {
                             "start": start_time,
                             "end": end_time,
                             "text": text
-                        })
+                        }
                         
                         # Обновляем прогресс на основе текущего тайминга сегмента
                         if progress_callback and total_audio_duration > 0:
@@ -260,16 +433,90 @@ class WhisperTranscriber:
             if progress_callback:
                 progress_callback(100, "Transcription completed")
             
-            duration = time.time() - start_time
-            self.logger.info(f"Transcription completed in {duration:.2f}s: {len(segments)} segments")
-            
-            return segments
+            duration = time.time() - started_at
+            self.logger.info(f"Transcription completed in {duration:.2f}s: {segment_count} segments")
             
         except Exception as e:
             error_msg = f"Transcription failed: {str(e)}"
             self.logger.error(error_msg)
             raise RuntimeError(error_msg)
     
+    def _audio_key(self, audio_path: str):
+        """Cache key that changes when the file is rewritten."""
+        stat = os.stat(audio_path)
+        return (audio_path, stat.st_mtime_ns, stat.st_size)
+    
+    @contextlib.contextmanager
+    def chunking(self, audio_path: str):
+        """
+        Keep an audio file decoded while several chunks of it are transcribed.
+        
+        transcribe and transcribe_chunk calls on the same file inside the
+        block reuse the samples; they are released when the block exits.
+        """
+        long_audio_path = get_long_path(audio_path)
+        self._audio_cache = (self._audio_key(long_audio_path), self._read_audio(long_audio_path))
+        try:
+            yield self
+        finally:
+            self._audio_cache = None
+    
+    def _load_audio(self, audio_path: str) -> np.ndarray:
+        """Read a whole audio file, or take it from the open chunking session."""
+        if self._audio_cache is not None and self._audio_cache[0] == self._audio_key(audio_path):
+            return self._audio_cache[1]
+        return self._read_audio(audio_path)
+    
+    def _read_audio(self, audio_path: str, start_time: float = 0.0, end_time: Optional[float] = None) -> np.ndarray:
+        """Read an audio file, or the part between two times, into a 16 kHz mono float32 array in the [-1.0, 1.0] range.
+        
+        16-bit WAVs at that rate (what AudioExtractor writes) are read
+        directly and downmixed if needed; anything else is converted by
+        FFmpeg through a pipe.
+        """
+        header = read_wav_header(audio_path)
+        if header is not None and header.sample_rate == SAMPLE_RATE and header.sample_width == 2:
+            self.logger.info("Reading WAV file...")
+            # Only the requested window is mapped, and the conversion reads
+            # the file pages directly instead of a copy of them
+            first_frame = int(start_time * SAMPLE_RATE)
+            last_frame = None if end_time is None else int(end_time * SAMPLE_RATE)
+            samples = pcm_to_float32(map_samples(audio_path, header, first_frame, last_frame))
+            return samples if header.channels == 1 else downmix_to_mono(samples, header.channels)
+        
+        return self._decode_with_ffmpeg(audio_path, start_time, end_time)
+    
+    def _decode_with_ffmpeg(self, audio_path: str, start_time: float = 0.0, end_time: Optional[float] = None) -> np.ndarray:
+        """Decode any audio FFmpeg can read to 16 kHz mono float32 samples."""
+        self.logger.info(f"Decoding audio with FFmpeg: {audio_path}")
+        command = [self.ffmpeg_manager.get_ffmpeg_path(), "-nostdin", "-hide_banner", "-loglevel", "error"]
+        if start_time:
+            command += ["-ss", str(start_time)]
+        command += ["-i", audio_path]
+        if end_time is not None:
+            command += ["-t", str(end_time - start_time)]
+        command += ["-f", "f32le", "-ac", "1", "-ar", str(SAMPLE_RATE), "pipe:1"]
+        
+        process = subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                   stderr=subprocess.PIPE, bufsize=FFMPEG_PIPE_BUFFER_SIZE)
+        if fcntl is not None and hasattr(fcntl, 'F_SETPIPE_SZ'):
+            try:
+                fcntl.fcntl(process.stdout.fileno(), fcntl.F_SETPIPE_SZ, FFMPEG_PIPE_BUFFER_SIZE)
+            except OSError:
+                # Above the system limit (/proc/sys/fs/pipe-max-size); keep the default
+                pass
+        
+        # stderr only carries errors at this log level, so it can't fill up while stdout is read
+        data = bytearray()
+        while chunk := process.stdout.read(FFMPEG_PIPE_BUFFER_SIZE):
+            data += chunk
+        error = process.stderr.read()
+        process.wait()
+        
+        if process.returncode != 0:
+            raise RuntimeError(f"FFmpeg could not decode audio: {error.decode(errors='replace').strip()}")
+        return np.frombuffer(data, dtype=np.float32)
+    
     def transcribe_chunk(self, audio_path: str, start_time: float, end_time: float) -> List[Dict[str, Any]]:
         """Transcribe a specific chunk of audio."""
         self.load_model()
@@ -278,33 +525,30 @@ class WhisperTranscriber:
             # Convert to long path to avoid issues with Windows 8.3 format
             long_audio_path = get_long_path(audio_path)
             
-            # Load and transcribe the specific segment
-            result = self.model.transcribe(
-                long_audio_path,
-                word_timestamps=True,
-                verbose=False
-            )
+            # Decode and transcribe only the requested window; timestamps
+            # come back relative to the chunk start
+            if self._audio_cache is not None and self._audio_cache[0] == self._audio_key(long_audio_path):
+                # The chunking session decoded the whole file; slice it instead of reading again
+                clip = self._audio_cache[1][int(start_time * SAMPLE_RATE):int(end_time * SAMPLE_RATE)]
+            else:
+                clip = self._read_audio(long_audio_path, start_time, end_time)
+            raw_segments, _ = self._run_model(clip)
             
-            # Filter segments within the time range
+            duration = end_time - start_time
             segments = []
-            for segment in result.get('segments', []):
+            for segment in raw_segments:
                 seg_start = float(segment.get('start', 0))
-                seg_end = float(segment.get('end', 0))
+                if seg_start >= duration:
+                    continue
                 
-                # Check if segment overlaps with requested time range
-                if seg_start <= end_time and seg_end >= start_time:
-                    # Adjust timestamps relative to chunk start
-                    adjusted_start = max(0, seg_start - start_time)
-                    adjusted_end = min(end_time - start_time, seg_end - start_time)
-                    
-                    segment_data = {
-                        'start': adjusted_start,
-                        'end': adjusted_end,
-                        'text': str(segment.get('text', '')).strip()
-                    }
-                    
-                    if segment_data['text']:
-                        segments.append(segment_data)
+                segment_data = {
+                    'start': max(0.0, seg_start),
+                    'end': min(duration, float(segment.get('end', 0))),
+                    'text': str(segment.get('text', '')).strip()
+                }
+                
+                if segment_data['text']:
+                    segments.append(segment_data)
             
             return segments
             
@@ -312,41 +556,13 @@ class WhisperTranscriber:
             self.logger.error(f"Chunk transcription failed: {str(e)}")
             raise
     
-    def get_available_models(self) -> List[str]:
+    def get_available_models(self) -> Tuple[str, ...]:
         """Get list of available Whisper models."""
-        return [
-            "tiny",
-            "tiny.en",
-            "base",
-            "base.en", 
-            "small",
-            "small.en",
-            "medium",
-            "medium.en",
-            "large-v1",
-            "large-v2",
-            "large"
-        ]
+        return AVAILABLE_MODELS
     
     def estimate_processing_time(self, audio_duration_seconds: float) -> float:
         """Estimate processing time based on audio duration and model size."""
-        # Rough estimates based on model size and typical performance
-        time_ratios = {
-            "tiny": 0.1,
-            "tiny.en": 0.1,
-            "base": 0.2,
-            "base.en": 0.2,
-            "small": 0.4,
-            "small.en": 0.4,
-            "medium": 0.8,
-            "medium.en": 0.8,
-            "large-v1": 1.5,
-            "large-v2": 1.5,
-            "large": 1.5
-        }
-        
-        ratio = time_ratios.get(self.model_name, 0.5)
-        return audio_duration_seconds * ratio
+        return audio_duration_seconds * PROCESSING_TIME_RATIOS.get(self.model_name, 0.5)
     
     def validate_audio_file(self, audio_path: str) -> bool:
         """Validate audio file for transcription."""
@@ -0,0 +1,85 @@
+"""
+Direct access to PCM WAV files without copying their samples.
+"""
+
+import os
+import struct
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+# WAVE_FORMAT_PCM and WAVE_FORMAT_EXTENSIBLE format tags
+PCM_FORMAT_TAGS = (0x0001, 0xFFFE)
+
+# Bytes read when looking for the fmt and data chunks; headers written by
+# FFmpeg carry a LIST chunk of metadata before the samples
+HEADER_READ_SIZE = 4096
+
+
+@dataclass
+class WavHeader:
+    """Layout of a PCM WAV file."""
+    sample_rate: int
+    channels: int
+    sample_width: int
+    data_offset: int
+    n_frames: int
+
+
+def read_wav_header(path: str) -> Optional[WavHeader]:
+    """
+    Parse the header of a PCM WAV file.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        The header, or None if the file is not a PCM WAV file
+    """
+    with open(path, 'rb') as f:
+        head = f.read(HEADER_READ_SIZE)
+    if len(head) < 12 or head[:4] != b'RIFF' or head[8:12] != b'WAVE':
+        return None
+
+    fmt = None
+    position = 12
+    while position + 8 <= len(head):
+        chunk_id, chunk_size = struct.unpack_from('<4sI', head, position)
+        body = position + 8
+        if chunk_id == b'fmt ' and body + 16 <= len(head):
+            fmt = struct.unpack_from('<HHIIHH', head, body)
+        elif chunk_id == b'data':
+            if fmt is None or fmt[0] not in PCM_FORMAT_TAGS:
+                return None
+            _, channels, sample_rate, _, block_align, bits = fmt
+            # Streamed WAVs leave the size unset, so trust the file length instead
+            data_size = min(chunk_size, os.path.getsize(path) - body)
+            return WavHeader(sample_rate, channels, bits // 8, body, data_size // block_align)
+        # Chunks are padded to an even length
+        position = body + chunk_size + (chunk_size & 1)
+    return None
+
+
+def map_samples(path: str, header: WavHeader, first_frame: int = 0,
+                last_frame: Optional[int] = None) -> np.ndarray:
+    """
+    Memory-map 16-bit samples of a WAV file; pages are read as they are used.
+
+    Args:
+        path: Path to the file
+        header: Its header from read_wav_header
+        first_frame: First frame to map
+        last_frame: Frame after the last one to map (default: end of file)
+
+    Returns:
+        Read-only int16 array of interleaved samples
+    """
+    last_frame = header.n_frames if last_frame is None else min(last_frame, header.n_frames)
+    first_frame = min(first_frame, last_frame)
+    count = (last_frame - first_frame) * header.channels
+    if count == 0:
+        # mmap refuses empty mappings
+        return np.empty(0, dtype=np.int16)
+    offset = header.data_offset + first_frame * header.channels * 2
+    return np.memmap(path, dtype='<i2', mode='r', offset=offset, shape=(count,))
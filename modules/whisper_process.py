@@ -0,0 +1,154 @@
+"""
+Whisper inference in a persistent child process.
+"""
+
+import multiprocessing as mp
+import queue
+import threading
+from typing import Callable, Optional, TYPE_CHECKING
+
+from utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from modules.segments import SegmentTable
+
+# Seconds between liveness checks of the worker while waiting for a reply
+POLL_INTERVAL = 1.0
+
+# Seconds to wait for a terminated worker to exit
+TERMINATE_TIMEOUT = 5.0
+
+def whisper_worker(model_name: str, language: Optional[str], batch_size: Optional[int], requests, responses):
+    """Child process entry point: load the model once and serve transcription requests.
+
+    Requests are audio file paths (None stops the worker). Replies are
+    (kind, payload) tuples where kind is 'ready', 'progress', 'done' or 'error'.
+    """
+    from modules.transcriber import WhisperTranscriber
+
+    try:
+        transcriber = WhisperTranscriber(model_name=model_name, language=language, batch_size=batch_size)
+        transcriber.load_model()
+    except Exception as e:
+        responses.put(('error', f"Failed to load Whisper model: {str(e)}"))
+        return
+
+    responses.put(('ready', None))
+
+    def report_progress(percentage, message=""):
+        responses.put(('progress', (percentage, message)))
+
+    while True:
+        audio_path = requests.get()
+        if audio_path is None:
+            break
+
+        try:
+            responses.put(('done', transcriber.transcribe(audio_path, report_progress)))
+        except Exception as e:
+            responses.put(('error', str(e)))
+
+class WhisperProcess:
+    """Handle to a Whisper model living in a separate process.
+
+    The model is loaded once when the process starts and reused for every
+    request. Inference does not compete with the GUI and extraction threads
+    for the GIL, and a crash or out-of-memory error in the model cannot take
+    the application down.
+    """
+
+    def __init__(self, model_name: str = "base", language: Optional[str] = None, batch_size: Optional[int] = None):
+        self.logger = get_logger()
+        self.model_name = model_name
+        self.language = language
+        self.batch_size = batch_size
+
+        # spawn gives the child a clean interpreter, which CUDA requires
+        context = mp.get_context("spawn")
+        self._requests = context.Queue()
+        self._responses = context.Queue()
+        self._process = context.Process(
+            target=whisper_worker,
+            args=(model_name, language, batch_size, self._requests, self._responses),
+            name=f"whisper-{model_name}",
+            daemon=True
+        )
+        self._ready = False
+        # Set once the worker has stopped or been terminated, so callers queued
+        # on the lock and the controller never send it another request
+        self._dead = False
+        # Requests are answered in order, so only one caller may talk to the worker at a time
+        self._lock = threading.Lock()
+
+        self._process.start()
+        self.logger.info(f"Started Whisper worker process (pid {self._process.pid}, model {model_name})")
+
+    def is_alive(self) -> bool:
+        """Check whether the worker process is still running and accepting requests."""
+        return not self._dead and self._process.is_alive()
+
+    def _receive(self):
+        """Wait for the next reply, failing if the worker process dies."""
+        while True:
+            try:
+                return self._responses.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                if not self._process.is_alive():
+                    raise RuntimeError(f"Whisper worker exited unexpectedly (exit code {self._process.exitcode})")
+
+    def transcribe(self, audio_path: str, progress_callback: Optional[Callable] = None) -> "SegmentTable":
+        """
+        Transcribe an audio file in the worker process.
+
+        Args:
+            audio_path: Path to audio file
+            progress_callback: Optional callback for progress updates
+
+        Returns:
+            SegmentTable of the segments; its arrays pickle far smaller
+            than one dict per segment
+        """
+        with self._lock:
+            if self._dead:
+                raise RuntimeError("Whisper worker has been stopped")
+
+            if not self._ready:
+                kind, payload = self._receive()
+                if kind == 'error':
+                    # The worker exits after failing to load the model
+                    self._dead = True
+                    raise RuntimeError(payload)
+                self._ready = True
+
+            self._requests.put(audio_path)
+
+            try:
+                while True:
+                    kind, payload = self._receive()
+                    if kind != 'progress':
+                        break
+                    if progress_callback:
+                        progress_callback(*payload)
+            except BaseException:
+                # The worker is still busy with a request nobody waits for, and its
+                # reply would be taken as the answer to the next one
+                self.terminate()
+                raise
+
+            if kind == 'error':
+                # The worker has answered and is idle again, so it stays usable
+                raise RuntimeError(payload)
+            return payload
+
+    def close(self):
+        """Ask the worker to exit once its current request is finished."""
+        if self._process.is_alive():
+            self._requests.put(None)
+
+    def terminate(self):
+        """Stop the worker immediately, abandoning its current request."""
+        self._dead = True
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join(TERMINATE_TIMEOUT)
+            self.logger.info(f"Terminated Whisper worker process (pid {self._process.pid})")
@@ -2,12 +2,17 @@
 Configuration and utility functions for the application.
 """
 
+import functools
 import os
 import sys
 from pathlib import Path
 
+@functools.lru_cache(maxsize=1)
 def get_app_data_dir() -> str:
-    """Get the application data directory based on the operating system."""
+    """Get the application data directory based on the operating system.
+    
+    Computed once per process; the environment it depends on doesn't change.
+    """
     if sys.platform == "win32":
         # Windows: use AppData/Roaming
         app_data = os.getenv("APPDATA")
@@ -34,41 +39,48 @@ def ensure_directory(dir_path: str) -> str:
     os.makedirs(dir_path, exist_ok=True)
     return dir_path
 
-def get_supported_video_formats() -> list:
+# Supported file extensions, in the order shown to the user
+SUPPORTED_VIDEO_FORMATS = (
+    '.mp4', '.mkv', '.avi', '.mov', '.wmv', 
+    '.flv', '.webm', '.m4v', '.3gp', '.ogv'
+)
+SUPPORTED_AUDIO_FORMATS = (
+    '.wav', '.mp3', '.m4a', '.flac', '.ogg', 
+    '.aac', '.wma', '.opus'
+)
+
+# Sets of the above for extension checks
+_VIDEO_EXTENSIONS = frozenset(SUPPORTED_VIDEO_FORMATS)
+_AUDIO_EXTENSIONS = frozenset(SUPPORTED_AUDIO_FORMATS)
+
+def get_supported_video_formats() -> tuple:
     """Get list of supported video file formats."""
-    return [
-        '.mp4', '.mkv', '.avi', '.mov', '.wmv', 
-        '.flv', '.webm', '.m4v', '.3gp', '.ogv'
-    ]
+    return SUPPORTED_VIDEO_FORMATS
 
-def get_supported_audio_formats() -> list:
+def get_supported_audio_formats() -> tuple:
     """Get list of supported audio file formats."""
-    return [
-        '.wav', '.mp3', '.m4a', '.flac', '.ogg', 
-        '.aac', '.wma', '.opus'
-    ]
+    return SUPPORTED_AUDIO_FORMATS
 
 def is_video_file(file_path: str) -> bool:
     """Check if file is a supported video format."""
-    ext = Path(file_path).suffix.lower()
-    return ext in get_supported_video_formats()
+    return Path(file_path).suffix.lower() in _VIDEO_EXTENSIONS
 
 def is_audio_file(file_path: str) -> bool:
     """Check if file is a supported audio format."""
-    ext = Path(file_path).suffix.lower()
-    return ext in get_supported_audio_formats()
+    return Path(file_path).suffix.lower() in _AUDIO_EXTENSIONS
+
+# Units for format_file_size, each 1024 times the previous one
+FILE_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
 
 def format_file_size(size_bytes: int) -> str:
     """Format file size in human readable format."""
     if size_bytes == 0:
         return "0 B"
     
-    size_names = ["B", "KB", "MB", "GB", "TB"]
-    import math
-    i = int(math.floor(math.log(size_bytes, 1024)))
-    p = math.pow(1024, i)
-    s = round(size_bytes / p, 2)
-    return f"{s} {size_names[i]}"
+    # Every unit is 10 more bits, so the bit length picks the unit without logarithms
+    i = min((size_bytes.bit_length() - 1) // 10, len(FILE_SIZE_UNITS) - 1)
+    s = round(size_bytes / (1 << (i * 10)), 2)
+    return f"{s} {FILE_SIZE_UNITS[i]}"
 
 def format_duration(seconds: float) -> str:
     """Format duration in HH:MM:SS format."""
@@ -2,6 +2,8 @@
 FFmpeg downloader and manager for automatic installation.
 """
 
+import functools
+import hashlib
 import os
 import sys
 import platform
@@ -9,14 +11,142 @@ import zipfile
 import tarfile
 import shutil
 import subprocess
+import tempfile
 from pathlib import Path
 from typing import Optional
+import http.client
 import urllib.request
 from urllib.error import URLError
 
 from utils.logger import get_logger
 from utils.config import get_app_data_dir
 
+# Platform the app runs on; it can't change while the app runs
+SYSTEM = platform.system()
+MACHINE = platform.machine().lower()
+
+# FFmpeg static builds URLs
+FFMPEG_BUILDS_URL = "https://github.com/BtbN/FFmpeg-Builds/releases/latest/download/"
+
+# Archive name and format of the build for each (system, machine); a None
+# machine matches any. Archives unpack into a directory named like the file.
+FFMPEG_BUILDS = {
+    ("Windows", "amd64"): ("ffmpeg-master-latest-win64-gpl.zip", 'zip'),
+    ("Windows", "x86_64"): ("ffmpeg-master-latest-win64-gpl.zip", 'zip'),
+    ("Linux", "x86_64"): ("ffmpeg-master-latest-linux64-gpl.tar.xz", 'tar'),
+    ("Linux", "amd64"): ("ffmpeg-master-latest-linux64-gpl.tar.xz", 'tar'),
+    ("Darwin", None): ("ffmpeg-master-latest-macos64-gpl.zip", 'zip'),
+}
+
+# Bytes requested from the download at a time
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# Seconds without data before a download connection is considered dropped
+DOWNLOAD_TIMEOUT = 30
+
+# Times an interrupted download is resumed before giving up
+DOWNLOAD_RETRIES = 3
+
+# Number of `ffmpeg -version` results kept; one per executable and build
+VERSION_CACHE_SIZE = 8
+
+# Tar extraction options; the 'data' filter (Python 3.12, backported to 3.8.17+)
+# also drops setuid bits and rejects links and devices
+TAR_EXTRACT_OPTIONS = {'filter': 'data'} if hasattr(tarfile, 'data_filter') else {}
+
+# Zip downloads up to this size are buffered in memory rather than a temp file
+ZIP_SPOOL_SIZE = 64 << 20
+
+class _DownloadReader:
+    """File-like view of a download that reports progress and survives dropped connections.
+    
+    When the connection fails or ends early, the rest is requested with an
+    HTTP Range header and reading continues where it stopped.
+    """
+    
+    def __init__(self, url: str, progress_callback=None):
+        self.url = url
+        self.progress_callback = progress_callback
+        self.downloaded = 0
+        # Hashed as it streams, so checking the archive needs no second pass
+        self.sha256 = hashlib.sha256()
+        self.last_percentage = -1
+        self.retries = 0
+        self.response = urllib.request.urlopen(url, timeout=DOWNLOAD_TIMEOUT)
+        self.total_size = int(self.response.headers.get('Content-Length') or 0)
+    
+    def _resume(self, error: Exception):
+        """Reopen the download at the first byte not yet received."""
+        self.retries += 1
+        if self.retries > DOWNLOAD_RETRIES or not self.total_size:
+            raise error
+        get_logger().warning(f"FFmpeg download interrupted at {self.downloaded} bytes, resuming: {error}")
+        self.response.close()
+        request = urllib.request.Request(self.url, headers={'Range': f"bytes={self.downloaded}-"})
+        self.response = urllib.request.urlopen(request, timeout=DOWNLOAD_TIMEOUT)
+        if self.response.status != 206:
+            # The server ignored the range and is sending the whole file again
+            self.response.close()
+            raise error
+    
+    def read(self, size: int = -1) -> bytes:
+        while True:
+            try:
+                data = self.response.read(size)
+            except (OSError, http.client.HTTPException) as e:
+                self._resume(e)
+                continue
+            if not data and self.downloaded < self.total_size:
+                self._resume(ConnectionError("Download ended early"))
+                continue
+            break
+        
+        self.downloaded += len(data)
+        self.sha256.update(data)
+        if self.progress_callback and self.total_size > 0:
+            percentage = min(int(self.downloaded * 100 / self.total_size), 100)
+            # Reads are small when the extractor pulls them, so only report
+            # whole-percent steps instead of a GUI update per read
+            if percentage != self.last_percentage:
+                self.last_percentage = percentage
+                self.progress_callback(percentage, f"Downloading... {percentage}%")
+        return data
+    
+    def close(self):
+        self.response.close()
+
+@functools.lru_cache(maxsize=VERSION_CACHE_SIZE)
+def _run_version(executable: str, mtime_ns: int) -> Optional[str]:
+    """Run `ffmpeg -version` and return its first line, or None if FFmpeg doesn't work."""
+    try:
+        result = subprocess.run(
+            [executable, '-version'],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            timeout=10
+        )
+    except (subprocess.TimeoutExpired, OSError):
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.partition('\n')[0]
+
+def _version_line(executable: str) -> Optional[str]:
+    """First line of `ffmpeg -version` for an executable path or name on PATH.
+    
+    The result is shared by all FFmpegManager instances and reused until
+    the executable is replaced.
+    """
+    path = shutil.which(executable)
+    if path is None:
+        return None
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    return _run_version(path, mtime_ns)
+
 class FFmpegManager:
     """Manage FFmpeg installation and usage."""
     
@@ -25,86 +155,80 @@ class FFmpegManager:
         self.app_data_dir = get_app_data_dir()
         self.ffmpeg_dir = os.path.join(self.app_data_dir, "ffmpeg")
         self.ffmpeg_executable = self._get_ffmpeg_executable_path()
+        self._resolved_path = None
+        # Set by download_ffmpeg when the archive could not be verified, for the GUI to show
+        self.verification_warning = None
         
     def _get_ffmpeg_executable_path(self) -> str:
         """Get the path to FFmpeg executable."""
-        if platform.system() == "Windows":
+        if SYSTEM == "Windows":
             return os.path.join(self.ffmpeg_dir, "bin", "ffmpeg.exe")
         else:
             return os.path.join(self.ffmpeg_dir, "bin", "ffmpeg")
     
     def _get_download_info(self) -> Optional[dict]:
         """Get download information for current platform."""
-        system = platform.system()
-        machine = platform.machine()
-        
-        # FFmpeg static builds URLs
-        base_url = "https://github.com/BtbN/FFmpeg-Builds/releases/latest/download/"
+        build = FFMPEG_BUILDS.get((SYSTEM, MACHINE)) or FFMPEG_BUILDS.get((SYSTEM, None))
+        if build is None:
+            return None
         
-        if system == "Windows":
-            if machine.lower() in ['amd64', 'x86_64']:
-                return {
-                    'url': f"{base_url}ffmpeg-master-latest-win64-gpl.zip",
-                    'format': 'zip',
-                    'extract_dir': 'ffmpeg-master-latest-win64-gpl'
-                }
-        elif system == "Linux":
-            if machine.lower() in ['x86_64', 'amd64']:
-                return {
-                    'url': f"{base_url}ffmpeg-master-latest-linux64-gpl.tar.xz",
-                    'format': 'tar',
-                    'extract_dir': 'ffmpeg-master-latest-linux64-gpl'
-                }
-        elif system == "Darwin":  # macOS
-            return {
-                'url': f"{base_url}ffmpeg-master-latest-macos64-gpl.zip",
-                'format': 'zip',
-                'extract_dir': 'ffmpeg-master-latest-macos64-gpl'
-            }
+        filename, archive_format = build
+        return {
+            'url': f"{FFMPEG_BUILDS_URL}{filename}",
+            'checksums': f"{FFMPEG_BUILDS_URL}checksums.sha256",
+            'format': archive_format,
+            'extract_dir': filename.split('.', 1)[0]
+        }
+    
+    def _verify_sha256(self, reader: "_DownloadReader", expected: Optional[str]):
+        """Raise unless the downloaded bytes match the published checksum (if there is one)."""
+        if expected is None:
+            return
+        if reader.sha256.hexdigest() != expected:
+            raise RuntimeError("Downloaded FFmpeg archive does not match its SHA-256 checksum")
+        self.logger.info("FFmpeg archive checksum verified")
+    
+    def _published_sha256(self, download_info: dict) -> Optional[str]:
+        """Fetch the SHA-256 the release lists for the archive, or None if unavailable."""
+        filename = download_info['url'].rsplit('/', 1)[-1]
+        try:
+            with urllib.request.urlopen(download_info['checksums'], timeout=DOWNLOAD_TIMEOUT) as response:
+                checksums = response.read().decode('utf-8', errors='replace')
+        except (OSError, http.client.HTTPException) as e:
+            self.logger.warning(f"Failed to fetch FFmpeg checksums: {e}")
+            return None
         
+        # sha256sum format: "<hex digest>  <file name>", with '*' before binary-mode names
+        for line in checksums.splitlines():
+            parts = line.split()
+            if len(parts) == 2 and parts[1].lstrip('*') == filename:
+                return parts[0].lower()
         return None
     
     def is_ffmpeg_available(self) -> bool:
         """Check if FFmpeg is available (system or bundled)."""
         # Check bundled FFmpeg first
-        if os.path.exists(self.ffmpeg_executable):
-            try:
-                result = subprocess.run(
-                    [self.ffmpeg_executable, '-version'],
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-                if result.returncode == 0:
-                    self.logger.info("Using bundled FFmpeg")
-                    return True
-            except (subprocess.TimeoutExpired, FileNotFoundError):
-                pass
+        if os.path.exists(self.ffmpeg_executable) and _version_line(self.ffmpeg_executable) is not None:
+            self.logger.info("Using bundled FFmpeg")
+            return True
         
         # Check system FFmpeg
-        try:
-            result = subprocess.run(
-                ['ffmpeg', '-version'],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            if result.returncode == 0:
-                self.logger.info("Using system FFmpeg")
-                return True
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
+        if _version_line('ffmpeg') is not None:
+            self.logger.info("Using system FFmpeg")
+            return True
         
         return False
     
     def get_ffmpeg_path(self) -> str:
-        """Get the path to FFmpeg executable to use."""
-        # Try bundled FFmpeg first
-        if os.path.exists(self.ffmpeg_executable):
-            return self.ffmpeg_executable
+        """Get the path to FFmpeg executable to use.
         
-        # Fall back to system FFmpeg
-        return "ffmpeg"
+        Resolved on the first call; download_ffmpeg resets it once the
+        bundled copy is installed.
+        """
+        if self._resolved_path is None:
+            # Try bundled FFmpeg first, then fall back to system FFmpeg
+            self._resolved_path = self.ffmpeg_executable if os.path.exists(self.ffmpeg_executable) else "ffmpeg"
+        return self._resolved_path
     
     def download_ffmpeg(self, progress_callback=None) -> bool:
         """Download and install FFmpeg."""
@@ -113,58 +237,84 @@ class FFmpegManager:
             self.logger.error("FFmpeg download not supported for this platform")
             return False
         
+        temp_dir = os.path.join(self.ffmpeg_dir, "temp")
+        self.verification_warning = None
         try:
             # Create directories
             os.makedirs(self.ffmpeg_dir, exist_ok=True)
-            temp_dir = os.path.join(self.ffmpeg_dir, "temp")
             os.makedirs(temp_dir, exist_ok=True)
+            extract_path = os.path.join(temp_dir, "extracted")
+            os.makedirs(extract_path, exist_ok=True)
             
-            # Download file
             download_url = download_info['url']
-            filename = os.path.basename(download_url)
-            download_path = os.path.join(temp_dir, filename)
-            
             self.logger.info(f"Downloading FFmpeg from: {download_url}")
             
             if progress_callback:
                 progress_callback(0, "Starting download...")
             
-            def progress_hook(block_num, block_size, total_size):
-                if progress_callback and total_size > 0:
-                    downloaded = block_num * block_size
-                    percentage = min(int(downloaded * 100 / total_size), 100)
-                    progress_callback(percentage, f"Downloading... {percentage}%")
-            
-            urllib.request.urlretrieve(download_url, download_path, progress_hook)
-            
-            if progress_callback:
-                progress_callback(90, "Extracting...")
+            # Fetched first so a zip can be checked before anything is extracted
+            expected_sha256 = self._published_sha256(download_info)
+            if expected_sha256 is None:
+                self.verification_warning = ("No published checksum was available for the FFmpeg download, "
+                                             "so its integrity could not be verified.")
+                self.logger.warning(self.verification_warning)
             
-            # Extract archive
-            extract_path = os.path.join(temp_dir, "extracted")
-            os.makedirs(extract_path, exist_ok=True)
-            
-            if download_info['format'] == 'zip':
-                with zipfile.ZipFile(download_path, 'r') as zip_ref:
-                    zip_ref.extractall(extract_path)
-            elif download_info['format'] == 'tar':
-                with tarfile.open(download_path, 'r:xz') as tar_ref:
-                    tar_ref.extractall(extract_path)
+            # The archive is unpacked as it arrives instead of being saved first
+            bin_prefix = f"{download_info['extract_dir']}/bin/"
+            reader = _DownloadReader(download_url, progress_callback)
+            try:
+                if download_info['format'] == 'zip':
+                    # The zip directory is at the end of the file, so the archive
+                    # is buffered, in memory while it is small enough
+                    with tempfile.SpooledTemporaryFile(max_size=ZIP_SPOOL_SIZE, dir=temp_dir) as spool:
+                        shutil.copyfileobj(reader, spool, DOWNLOAD_CHUNK_SIZE)
+                        self._verify_sha256(reader, expected_sha256)
+                        if progress_callback:
+                            progress_callback(90, "Extracting...")
+                        spool.seek(0)
+                        with zipfile.ZipFile(spool, 'r') as zip_ref:
+                            # Only the executables are installed; skip docs, headers and libraries
+                            members = [info for info in zip_ref.infolist() if info.filename.startswith(bin_prefix)]
+                            zip_ref.extractall(extract_path, members)
+                elif download_info['format'] == 'tar':
+                    # Stream mode reads the archive front to back without seeking
+                    bin_path = os.path.join(extract_path, download_info['extract_dir'], "bin")
+                    with tarfile.open(fileobj=reader, mode='r|xz') as tar_ref:
+                        # Members are extracted as they go by; the rest is only decompressed
+                        for member in tar_ref:
+                            if not (member.isfile() and member.name.startswith(bin_prefix)):
+                                continue
+                            # Flatten to the bare file name so a name like
+                            # "bin/../../x" cannot be written outside bin_path
+                            name = os.path.basename(member.name)
+                            if name in ('', '.', '..'):
+                                continue
+                            member.name = name
+                            tar_ref.extract(member, bin_path, **TAR_EXTRACT_OPTIONS)
+                    # tarfile stops at the end-of-archive marker; hash the padding after it too
+                    while reader.read(DOWNLOAD_CHUNK_SIZE):
+                        pass
+                    # The hash is only complete now; the files so far are confined
+                    # to temp_dir, which is removed if the check fails
+                    self._verify_sha256(reader, expected_sha256)
+            finally:
+                reader.close()
             
             # Move extracted files
             extracted_dir = os.path.join(extract_path, download_info['extract_dir'])
             if os.path.exists(extracted_dir):
-                # Copy bin directory
+                # Move the bin directory; temp_dir is inside ffmpeg_dir, so this
+                # is a rename rather than a copy of the binaries
                 src_bin = os.path.join(extracted_dir, "bin")
                 dst_bin = os.path.join(self.ffmpeg_dir, "bin")
                 
                 if os.path.exists(src_bin):
                     if os.path.exists(dst_bin):
                         shutil.rmtree(dst_bin)
-                    shutil.copytree(src_bin, dst_bin)
+                    os.replace(src_bin, dst_bin)
                 
                 # Make executable on Unix systems
-                if platform.system() != "Windows":
+                if SYSTEM != "Windows":
                     ffmpeg_path = os.path.join(dst_bin, "ffmpeg")
                     if os.path.exists(ffmpeg_path):
                         os.chmod(ffmpeg_path, 0o755)
@@ -176,6 +326,7 @@ class FFmpegManager:
                 progress_callback(100, "Installation complete!")
             
             # Verify installation
+            self._resolved_path = None
             if os.path.exists(self.ffmpeg_executable):
                 self.logger.info("FFmpeg downloaded and installed successfully")
                 return True
@@ -189,7 +340,7 @@ class FFmpegManager:
             try:
                 if os.path.exists(temp_dir):
                     shutil.rmtree(temp_dir)
-            except:
+            except OSError:
                 pass
             return False
     
@@ -203,18 +354,4 @@ class FFmpegManager:
     
     def get_version_info(self) -> Optional[str]:
         """Get FFmpeg version information."""
-        try:
-            ffmpeg_path = self.get_ffmpeg_path()
-            result = subprocess.run(
-                [ffmpeg_path, '-version'],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            if result.returncode == 0:
-                # Extract version from first line
-                first_line = result.stdout.split('\n')[0]
-                return first_line
-        except:
-            pass
-        return None
\ No newline at end of file
+        return _version_line(self.get_ffmpeg_path())
@@ -1,29 +1,59 @@
+import collections
 import logging
 import sys
+import threading
 from PySide6.QtWidgets import QPlainTextEdit
-from PySide6.QtCore import QObject, Signal
+from PySide6.QtCore import QObject, Qt, Signal
+from PySide6.QtGui import QTextCursor
+
+from utils.logger import FastFormatter
+
+# Lines kept for the console between repaints; older ones would scroll out
+# of LogConsoleWidget's block limit anyway
+LOG_BUFFER_SIZE = 1000
 
 
 class QtLogHandler(logging.Handler, QObject):
     """
-    Custom log handler that emits signals for each log message.
+    Custom log handler that emits signals with batches of log messages.
     This allows log messages to be displayed in the UI.
+    
+    Records are buffered and delivered through the event loop, so a burst
+    logged from worker threads reaches the console as one signal with all
+    of its lines instead of one signal and repaint per record.
     """
     log_message_received = Signal(str)
+    _flush_requested = Signal()
     
     def __init__(self, level=logging.NOTSET):
         QObject.__init__(self)
         logging.Handler.__init__(self, level)
-        self.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s', 
-                                            datefmt='%H:%M:%S'))
+        self.setFormatter(FastFormatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s', 
+                                        datefmt='%H:%M:%S'))
+        self._pending = collections.deque(maxlen=LOG_BUFFER_SIZE)
+        self._pending_lock = threading.Lock()
+        self._flush_requested.connect(self._flush, Qt.QueuedConnection)
         
     def emit(self, record):
-        """Emit a log message as a signal"""
+        """Queue a log message for the next batch"""
         try:
             msg = self.format(record)
-            self.log_message_received.emit(msg)
+            with self._pending_lock:
+                # Only the first record of a batch schedules a flush
+                schedule = not self._pending
+                self._pending.append(msg)
+            if schedule:
+                self._flush_requested.emit()
         except Exception:
             self.handleError(record)
+    
+    def _flush(self):
+        """Emit all queued messages as one signal (runs on the handler's thread)"""
+        with self._pending_lock:
+            messages = list(self._pending)
+            self._pending.clear()
+        if messages:
+            self.log_message_received.emit("\n".join(messages))
 
 
 class LogConsoleWidget(QPlainTextEdit):
@@ -44,10 +74,19 @@ class LogConsoleWidget(QPlainTextEdit):
         """)
         
     def append_log(self, message):
-        """Add log message to the console"""
-        self.appendPlainText(message)
-        # Auto scroll to bottom
-        self.verticalScrollBar().setValue(self.verticalScrollBar().maximum())
+        """Add log messages (one batch of lines) to the console"""
+        scroll_bar = self.verticalScrollBar()
+        at_bottom = scroll_bar.value() == scroll_bar.maximum()
+        
+        # One insert for the whole batch, through a separate cursor so the
+        # user's selection stays where it is
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(message if self.document().isEmpty() else "\n" + message)
+        
+        # Follow new output unless the user has scrolled up to read history
+        if at_bottom:
+            scroll_bar.setValue(scroll_bar.maximum())
 
     def clear_logs(self):
         """Clear all log messages"""
@@ -70,13 +109,15 @@ def setup_qt_logger(console_widget=None):
     # Удаляем все существующие обработчики
     for handler in logger.handlers[:]:  # Создаем копию списка перед его изменением
         logger.removeHandler(handler)
+        # Release the log files, which would otherwise stay open for the whole session
+        handler.close()
     
     # Настраиваем уровень логирования
     logger.setLevel(logging.INFO)
     
     # Если консольный виджет не передан, настраиваем стандартный вывод в консоль
     if console_widget is None:
-        console_formatter = logging.Formatter(
+        console_formatter = FastFormatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
             datefmt='%H:%M:%S'
         )
@@ -2,21 +2,75 @@
 Logging configuration for the application.
 """
 
+import functools
+import glob
 import logging
+import multiprocessing
 import os
 import sys
+import time
+from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
 from pathlib import Path
-from datetime import datetime
 
 from utils.config import get_app_data_dir, ensure_directory
 
-# Global logger instance
-_logger = None
+# No format shows thread or process details, so LogRecord needn't look them up
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
 
+# Daily log files kept besides the current one
+LOG_BACKUP_DAYS = 7
+
+# Size at which the error log is rotated, and the number of old ones kept
+ERROR_LOG_MAX_BYTES = 5 << 20
+ERROR_LOG_BACKUPS = 3
+
+class FastFormatter(logging.Formatter):
+    """Formatter that formats the time of a record once per second.
+    
+    Records logged in the same second share the asctime string instead of
+    each calling localtime and strftime.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (second, datefmt, formatted time) of the last record
+        self._cached_time = (None, None, "")
+    
+    def formatTime(self, record: logging.LogRecord, datefmt=None) -> str:
+        if datefmt is None:
+            # The default format includes milliseconds, which change every record
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        cached_second, cached_datefmt, text = self._cached_time
+        if second != cached_second or datefmt != cached_datefmt:
+            text = super().formatTime(record, datefmt)
+            self._cached_time = (second, datefmt, text)
+        return text
+
+class SharedFormatter(FastFormatter):
+    """Formatter that formats each record once for all handlers sharing it.
+    
+    An error goes to both the main and the error log; the second handler
+    gets the text the first one produced.
+    """
+    
+    def format(self, record: logging.LogRecord) -> str:
+        cached = record.__dict__.get('_shared_format')
+        if cached is not None and cached[0] is self:
+            return cached[1]
+        text = super().format(record)
+        record._shared_format = (self, text)
+        return text
+
+@functools.lru_cache(maxsize=None)
 def setup_logger(name: str = "VideoTranscriber", level: int = logging.INFO) -> logging.Logger:
     """
     Setup and configure the application logger.
     
+    Each logger is configured once; later calls return it from the cache.
+    
     Args:
         name: Logger name
         level: Logging level
@@ -24,11 +78,6 @@ def setup_logger(name: str = "VideoTranscriber", level: int = logging.INFO) -> l
     Returns:
         Configured logger instance
     """
-    global _logger
-    
-    if _logger is not None:
-        return _logger
-    
     # Create logger
     logger = logging.getLogger(name)
     logger.setLevel(level)
@@ -38,12 +87,12 @@ def setup_logger(name: str = "VideoTranscriber", level: int = logging.INFO) -> l
         return logger
     
     # Create formatters
-    console_formatter = logging.Formatter(
+    console_formatter = FastFormatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         datefmt='%H:%M:%S'
     )
     
-    file_formatter = logging.Formatter(
+    file_formatter = SharedFormatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
@@ -54,12 +103,39 @@ def setup_logger(name: str = "VideoTranscriber", level: int = logging.INFO) -> l
     console_handler.setFormatter(console_formatter)
     logger.addHandler(console_handler)
     
-    # File handler
+    log_dir = None
     try:
         log_dir = ensure_directory(os.path.join(get_app_data_dir(), "logs"))
-        log_file = os.path.join(log_dir, f"{name}_{datetime.now().strftime('%Y%m%d')}.log")
+    except Exception as e:
+        logger.warning(f"Failed to setup file logging: {e}")
+    
+    process = multiprocessing.current_process()
+    if log_dir is not None and process.name != "MainProcess":
+        # Child processes (the Whisper worker) get a file of their own: rotating
+        # renames the file, which fails or clobbers backups while another
+        # process has it open. Old ones are pruned by the main process.
+        try:
+            log_file = os.path.join(log_dir, f"{name}-{process.name}-{process.pid}.log")
+            file_handler = logging.FileHandler(log_file, encoding='utf-8', delay=True)
+            file_handler.setLevel(logging.DEBUG)
+            file_handler.setFormatter(file_formatter)
+            logger.addHandler(file_handler)
+        except Exception as e:
+            logger.warning(f"Failed to setup file logging: {e}")
+        return logger
+    
+    if log_dir is None:
+        return logger
+    
+    _prune_process_logs(log_dir, name)
+    
+    # File handler
+    try:
+        log_file = os.path.join(log_dir, f"{name}.log")
         
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        # Starts a new file at midnight even if the app stays open, keeping a week of them
+        file_handler = TimedRotatingFileHandler(log_file, when='midnight', backupCount=LOG_BACKUP_DAYS,
+                                                encoding='utf-8', delay=True)
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(file_formatter)
         logger.addHandler(file_handler)
@@ -71,7 +147,8 @@ def setup_logger(name: str = "VideoTranscriber", level: int = logging.INFO) -> l
     # Error handler for critical errors
     try:
         error_log_file = os.path.join(log_dir, f"{name}_errors.log")
-        error_handler = logging.FileHandler(error_log_file, encoding='utf-8')
+        error_handler = RotatingFileHandler(error_log_file, maxBytes=ERROR_LOG_MAX_BYTES,
+                                            backupCount=ERROR_LOG_BACKUPS, encoding='utf-8', delay=True)
         error_handler.setLevel(logging.ERROR)
         error_handler.setFormatter(file_formatter)
         logger.addHandler(error_handler)
@@ -80,53 +157,79 @@ def setup_logger(name: str = "VideoTranscriber", level: int = logging.INFO) -> l
         # Ignore if error file logging fails
         pass
     
-    _logger = logger
     return logger
 
+def _prune_process_logs(log_dir: str, name: str):
+    """Delete child process log files older than LOG_BACKUP_DAYS."""
+    cutoff = time.time() - LOG_BACKUP_DAYS * 86400
+    for path in glob.glob(os.path.join(glob.escape(log_dir), f"{glob.escape(name)}-*.log")):
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            # Still open in a running worker on Windows, or already gone
+            pass
+
 def get_logger() -> logging.Logger:
     """Get the current logger instance."""
-    global _logger
-    
-    if _logger is None:
-        _logger = setup_logger()
-    
-    return _logger
+    return setup_logger()
 
 def log_exception(logger: logging.Logger, message: str = "An error occurred"):
     """Log an exception with traceback."""
     import traceback
     logger.error(f"{message}: {traceback.format_exc()}")
 
-def log_system_info(logger: logging.Logger):
-    """Log system information for debugging."""
+@functools.lru_cache(maxsize=1)
+def _psutil():
+    """Import psutil on first use, or return None if it isn't installed."""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil
+
+@functools.lru_cache(maxsize=1)
+def _static_system_info() -> dict:
+    """System details that don't change while the app runs."""
     import platform
-    import psutil
     
+    psutil = _psutil()
+    info = {
+        'Platform': platform.platform(),
+        'Python': platform.python_version(),
+        'CPU Count': os.cpu_count(),
+    }
+    if psutil is not None:
+        info['CPU Count'] = psutil.cpu_count()
+        info['Memory'] = f"{psutil.virtual_memory().total // (1024**3)} GB"
+    return info
+
+def log_system_info(logger: logging.Logger):
+    """Log system information for debugging."""
+    psutil = _psutil()
     try:
         logger.info("=== System Information ===")
-        logger.info(f"Platform: {platform.platform()}")
-        logger.info(f"Python: {platform.python_version()}")
-        logger.info(f"CPU Count: {psutil.cpu_count()}")
-        logger.info(f"Memory: {psutil.virtual_memory().total // (1024**3)} GB")
-        logger.info(f"Available Memory: {psutil.virtual_memory().available // (1024**3)} GB")
+        for key, value in _static_system_info().items():
+            logger.info(f"{key}: {value}")
+        if psutil is not None:
+            # Free memory is the only value that changes between calls
+            logger.info(f"Available Memory: {psutil.virtual_memory().available // (1024**3)} GB")
         logger.info("=========================")
     except Exception as e:
         logger.warning(f"Failed to log system info: {e}")
 
 def set_log_level(level: int):
     """Set the logging level for all handlers."""
-    global _logger
-    
-    if _logger:
-        _logger.setLevel(level)
-        for handler in _logger.handlers:
-            if isinstance(handler, logging.StreamHandler) and not isinstance(handler, logging.FileHandler):
-                handler.setLevel(max(level, logging.INFO))  # Console minimum INFO
-            elif isinstance(handler, logging.FileHandler):
-                if "error" in handler.baseFilename.lower():
-                    handler.setLevel(logging.ERROR)  # Keep error file at ERROR level
-                else:
-                    handler.setLevel(logging.DEBUG)  # Regular file at DEBUG level
+    logger = get_logger()
+    logger.setLevel(level)
+    for handler in logger.handlers:
+        if isinstance(handler, logging.StreamHandler) and not isinstance(handler, logging.FileHandler):
+            handler.setLevel(max(level, logging.INFO))  # Console minimum INFO
+        elif isinstance(handler, logging.FileHandler):
+            if "error" in handler.baseFilename.lower():
+                handler.setLevel(logging.ERROR)  # Keep error file at ERROR level
+            else:
+                handler.setLevel(logging.DEBUG)  # Regular file at DEBUG level
 
 # Convenience functions for common log levels
 def debug(message: str):